@@ -1,15 +1,38 @@
-"""UC3M Care MODULE WITH ALL THE FEATURES REQUIRED FOR ACCESS CONTROL"""
-
-from uc3m_care.data.vaccine_patient_register import VaccinePatientRegister
-from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
-from uc3m_care.data.vaccination_appointment import VaccinationAppointment
-from uc3m_care.cfg.vaccine_manager_config import JSON_FILES_PATH
-from uc3m_care.cfg.vaccine_manager_config import JSON_FILES_RF2_PATH
-from uc3m_care.cfg.vaccine_manager_config import JSON_FILES_FP_PATH
-from uc3m_care.vaccine_manager import VaccineManager
-from uc3m_care.storage.patients_json_store import PatientsJsonStore
-from uc3m_care.storage.appointments_json_store import AppointmentsJsonStore
-from uc3m_care.storage.vaccination_json_store import VaccinationJsonStore
-from uc3m_care.storage.cancellation_json_store import CancellationJsonStore
-from uc3m_care.storage.final_cancelled_appointments import FinalCancelledAppointmentJsonStore
-from uc3m_care.storage.temporal_cancelled_appointments import TemporalCancelledAppointmentJsonStore
\ No newline at end of file
+"""UC3M Care MODULE WITH ALL THE FEATURES REQUIRED FOR ACCESS CONTROL
+
+The names of the package are imported from their modules the first time
+they are used, so importing the package alone does not load the stores."""
+import importlib
+
+_LAZY_NAMES = {
+    "VaccinePatientRegister": "uc3m_care.data.vaccine_patient_register",
+    "VaccineManagementException": "uc3m_care.exception.vaccine_management_exception",
+    "VaccinationAppointment": "uc3m_care.data.vaccination_appointment",
+    "JSON_FILES_PATH": "uc3m_care.cfg.vaccine_manager_config",
+    "JSON_FILES_RF2_PATH": "uc3m_care.cfg.vaccine_manager_config",
+    "JSON_FILES_FP_PATH": "uc3m_care.cfg.vaccine_manager_config",
+    "VaccineManager": "uc3m_care.vaccine_manager",
+    "AsyncVaccineManager": "uc3m_care.async_vaccine_manager",
+    "PatientsJsonStore": "uc3m_care.storage.patients_json_store",
+    "AppointmentsJsonStore": "uc3m_care.storage.appointments_json_store",
+    "VaccinationJsonStore": "uc3m_care.storage.vaccination_json_store",
+    "CancellationJsonStore": "uc3m_care.storage.cancellation_json_store",
+    "FinalCancelledAppointmentJsonStore": "uc3m_care.storage.final_cancelled_appointments",
+    "TemporalCancelledAppointmentJsonStore":
+        "uc3m_care.storage.temporal_cancelled_appointments",
+}
+
+__all__ = list(_LAZY_NAMES)
+
+
+def __getattr__(name):
+    """Imports a name of the package from its module the first time it is used"""
+    if name not in _LAZY_NAMES:
+        raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+    value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES))
@@ -0,0 +1,83 @@
+"""Module for using the VaccineManager from asyncio"""
+import asyncio
+import contextlib
+import functools
+
+from uc3m_care.cfg.vaccine_manager_config import ASYNC_MAX_CONCURRENCY
+from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
+from uc3m_care.parser.appointment_json_parser import AppointmentJsonParser
+from uc3m_care.parser.cancellation_json_parser import CancellationJsonParser
+from uc3m_care.vaccine_manager import VaccineManager
+
+
+class AsyncVaccineManager:
+    """Provides the methods of the VaccineManager as coroutines
+
+    The methods run in the executor (the default one of the event loop if
+    None), so the file and store I/O never blocks the loop. At most
+    max_concurrency of them run at a time, and the ones for the same patient
+    (patient_id or patient_sys_id) or the same date_signature run one after
+    the other. An instance is meant to be used from a single event loop."""
+
+    def __init__(self, max_concurrency=ASYNC_MAX_CONCURRENCY, executor=None):
+        self._manager = VaccineManager()
+        self._executor = executor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # lock of each key and number of calls using it
+        self._key_locks = {}
+
+    async def _run(self, function, *args):
+        """Runs the function in the executor, bounding the calls running at once"""
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(function, *args))
+
+    @contextlib.asynccontextmanager
+    async def _serialized(self, key):
+        """Runs the block after the blocks already running or waiting for the key"""
+        entry = self._key_locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._key_locks[key]
+
+    async def _input_file_key(self, parser_class, json_key, input_file):
+        """Reads the key of the input file, None if the file is not valid (the call
+        using it raises the error)"""
+        def read_key():
+            try:
+                return parser_class(input_file).json_content[json_key]
+            except VaccineManagementException:
+                return None
+        return await self._run(read_key)
+
+    # pylint: disable=too-many-arguments
+    async def request_vaccination_id(self, patient_id, name_surname, registration_type,
+                                     phone_number, age):
+        """Register the patient into the patients file"""
+        async with self._serialized(("patient_id", patient_id)):
+            return await self._run(self._manager.request_vaccination_id, patient_id,
+                                   name_surname, registration_type, phone_number, age)
+
+    async def get_vaccine_date(self, input_file, date: str):
+        """Gets an appointment for a registered patient"""
+        patient_sys_id = await self._input_file_key(
+            AppointmentJsonParser, AppointmentJsonParser.PATIENT_SYSTEM_ID_KEY, input_file)
+        async with self._serialized(("patient_sys_id", patient_sys_id)):
+            return await self._run(self._manager.get_vaccine_date, input_file, date)
+
+    async def cancel_appointment(self, input_file):
+        """Cancels the appointment of the input file"""
+        date_signature = await self._input_file_key(
+            CancellationJsonParser, CancellationJsonParser.DATE_SIGNATURE_KEY, input_file)
+        async with self._serialized(("date_signature", date_signature)):
+            return await self._run(self._manager.cancel_appointment, input_file)
+
+    async def vaccine_patient(self, date_signature):
+        """Register the vaccination of the patient"""
+        async with self._serialized(("date_signature", date_signature)):
+            return await self._run(self._manager.vaccine_patient, date_signature)
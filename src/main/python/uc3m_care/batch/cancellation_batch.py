@@ -0,0 +1,97 @@
+"""Batch of cancel_appointment requests"""
+import json
+
+from uc3m_care.data.vaccination_appointment import VaccinationAppointment
+from uc3m_care.data.vaccination_cancellation import VaccinationCancellation
+from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
+from uc3m_care.parser.cancellation_json_parser import CancellationJsonParser
+from uc3m_care.storage.store_transaction import StoreTransaction
+
+
+class CancellationBatch:
+    """Cancels the appointments of many cancellation inputs in one transaction
+
+    The inputs are a list of JSON files or the path of a JSONL file, whose
+    lines are named in the results as "file:line". The results are a list
+    of (name, result) pairs in the order of the inputs, so an input given
+    twice gets both of its results. The values of all the
+    inputs are checked by columns first. Every cancellation is checked against
+    the stores, loaded once and looked up by their indexes, their appointments
+    are verified together and each one against the previous ones of the batch;
+    then the changes of all of them are committed together."""
+    ALREADY_CANCELLED_ERROR = "The appointment was already cancelled"
+
+    def __init__(self, inputs):
+        self._inputs = inputs
+
+    @staticmethod
+    def _jsonl_inputs(jsonl_file):
+        """Yields the name and the parser, or the error, of every line of a JSONL file"""
+        try:
+            with open(jsonl_file, "r", encoding="utf-8", newline="") as file:
+                for line_number, line in enumerate(file, 1):
+                    if not line.strip():
+                        continue
+                    name = jsonl_file + ":" + str(line_number)
+                    try:
+                        yield name, CancellationJsonParser.from_json_content(json.loads(line))
+                    except json.JSONDecodeError:
+                        yield name, VaccineManagementException(
+                            "JSON Decode Error - Wrong JSON Format")
+                    except VaccineManagementException as exception_raised:
+                        yield name, exception_raised
+        except FileNotFoundError as ex:
+            raise VaccineManagementException("File is not found") from ex
+
+    @staticmethod
+    def _file_inputs(input_files):
+        """Yields the name and the parser, or the error, of every input file"""
+        for input_file in input_files:
+            try:
+                yield input_file, CancellationJsonParser(input_file)
+            except VaccineManagementException as exception_raised:
+                yield input_file, exception_raised
+
+    def _parsed_inputs(self):
+        """Yields the name and the parser, or the error, of every input"""
+        if isinstance(self._inputs, str):
+            return self._jsonl_inputs(self._inputs)
+        return self._file_inputs(self._inputs)
+
+    def run(self):
+        """Cancels the appointments, returns the name and the date_signature, or the
+        error, of every input in their order"""
+        inputs = list(self._parsed_inputs())
+        parsers = [parser for _, parser in inputs
+                   if not isinstance(parser, VaccineManagementException)]
+        cancellations = iter(VaccinationCancellation.create_cancellations_from_parsers(parsers))
+        results = [[name, None] for name, _ in inputs]
+        to_cancel = []
+        for position, (_, parser) in enumerate(inputs):
+            cancellation = parser if isinstance(parser, VaccineManagementException) \
+                else next(cancellations)
+            try:
+                if isinstance(cancellation, VaccineManagementException):
+                    raise cancellation
+                appointment = VaccinationAppointment.appointment_to_cancel(cancellation,
+                                                                           verify=False)
+            except VaccineManagementException as exception_raised:
+                results[position][1] = exception_raised
+                continue
+            to_cancel.append((position, cancellation, appointment))
+        errors = VaccinationAppointment.verify_appointments(
+            [appointment for _, _, appointment in to_cancel])
+        cancelled = set()
+        with StoreTransaction() as transaction:
+            for position, cancellation, appointment in to_cancel:
+                if cancellation.date_signature in errors:
+                    results[position][1] = errors[cancellation.date_signature]
+                    continue
+                if cancellation.date_signature in cancelled:
+                    results[position][1] = VaccineManagementException(
+                        self.ALREADY_CANCELLED_ERROR)
+                    continue
+                appointment.cancel_appointment(cancellation, transaction)
+                cancelled.add(cancellation.date_signature)
+                results[position][1] = cancellation.date_signature
+        return [(name, result) for name, result in results]
@@ -0,0 +1,100 @@
+"""Bulk registration of the patients of a CSV or JSONL file"""
+import csv
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from uc3m_care.cfg.vaccine_manager_config import BULK_CHUNK_SIZE, BULK_WORKERS
+from uc3m_care.data.vaccine_patient_register import VaccinePatientRegister
+from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
+from uc3m_care.parser.patient_rows_parser import PatientRowsParser
+from uc3m_care.storage.patients_json_store import PatientsJsonStore
+
+
+def build_patients(chunk):
+    """Returns the number and the patient, or the error, of every row of a chunk
+
+    The values of the rows are checked by columns, so the rows with errors
+    do not raise exceptions."""
+    rows = [[row[key] for key in PatientRowsParser.ROW_KEYS] for _, row in chunk
+            if not isinstance(row, VaccineManagementException)]
+    patients = iter(VaccinePatientRegister.create_patients(rows))
+    return [(row_number, row if isinstance(row, VaccineManagementException) else next(patients))
+            for row_number, row in chunk]
+
+
+class PatientRegistrationImport:
+    """Registers the patients of a file in chunks of chunk_size rows
+
+    The rows are read lazily and validated by VaccinePatientRegister. The
+    patients of a chunk are added to the patients store at once, which checks
+    them against its index of patient ids, including the patients registered
+    before in the same file. The results file is a CSV file with the row
+    number and the patient_sys_id, or the error, of every row.
+
+    With more than one worker the patients are validated and built, which
+    is CPU bound, by a pool of worker processes, while this process adds
+    them to the store in the order of the file."""
+    RESULTS_HEADER = ["row", "patient_sys_id", "error"]
+
+    def __init__(self, input_file, results_file, chunk_size=BULK_CHUNK_SIZE,
+                 workers=BULK_WORKERS):
+        self._parser = PatientRowsParser(input_file)
+        self._results_file = results_file
+        self._chunk_size = chunk_size
+        self._workers = workers
+
+    def run(self):
+        """Registers the patients of the file, returns the number of rows registered
+        and the number of rows with errors"""
+        registered = errors = 0
+        rows = self._parser.rows()
+        try:
+            with open(self._results_file, "w", encoding="utf-8", newline="") as file:
+                results_writer = csv.writer(file)
+                results_writer.writerow(self.RESULTS_HEADER)
+                chunks = iter(lambda: list(islice(rows, self._chunk_size)), [])
+                for built_chunk in self._built_chunks(chunks):
+                    for row_number, result in self._register_chunk(built_chunk):
+                        if isinstance(result, VaccineManagementException):
+                            errors += 1
+                            results_writer.writerow([row_number, "", result.message])
+                        else:
+                            registered += 1
+                            results_writer.writerow([row_number, result, ""])
+                    file.flush()
+        except FileNotFoundError as ex:
+            raise VaccineManagementException("Wrong file or file path") from ex
+        return {"registered": registered, "errors": errors}
+
+    def _built_chunks(self, chunks):
+        """Yields the patients built from every chunk, in the order of the chunks
+
+        The pool is sent at most two chunks per worker ahead of the one being
+        registered, so the rows are still read lazily."""
+        if self._workers <= 1:
+            yield from map(build_patients, chunks)
+            return
+        with ProcessPoolExecutor(self._workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(build_patients, chunk))
+                if len(pending) >= 2 * self._workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    @staticmethod
+    def _register_chunk(built):
+        """Registers the valid patients built from a chunk of rows, returns the number
+        and the patient_sys_id or error of every row"""
+        patients = [patient for _, patient in built
+                    if isinstance(patient, VaccinePatientRegister)]
+        store_errors = {id(result.item): result.error
+                        for result in PatientsJsonStore().add_items(patients)
+                        if result.error is not None}
+        for row_number, patient in built:
+            if isinstance(patient, VaccineManagementException):
+                yield row_number, patient
+            else:
+                yield row_number, store_errors.get(id(patient), patient.patient_sys_id)
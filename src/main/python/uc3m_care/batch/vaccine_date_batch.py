@@ -0,0 +1,91 @@
+"""Batch of get_vaccine_date requests"""
+import glob
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from uc3m_care.cfg.vaccine_manager_config import BATCH_READ_THREADS
+from uc3m_care.data.vaccination_appointment import VaccinationAppointment
+from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
+from uc3m_care.parser.appointment_json_parser import AppointmentJsonParser
+from uc3m_care.storage.appointments_json_store import AppointmentsJsonStore
+
+
+class VaccineDateBatch:
+    """Gets the appointments of many (input_file, date) requests at once
+
+    The input files are parsed by a pool of threads, the appointments are
+    created against the patients store loaded once and all of them are added
+    to the appointments store in a single commit. The results are a list of
+    (request, result) pairs in the order of the requests, so a request given
+    twice gets the date_signature of each of its appointments."""
+    BAD_MANIFEST_ERROR = "Bad manifest format"
+    MISSING_DATE_ERROR = "The date of the requests is missing"
+
+    def __init__(self, requests, read_threads=BATCH_READ_THREADS):
+        self._requests = [tuple(request) for request in requests]
+        self._read_threads = read_threads
+
+    @classmethod
+    def from_source(cls, source, date=None):
+        """Returns the batch of the requests of a source: a list of (input_file, date)
+        pairs, a JSON manifest with a list of {"input_file", "date"} objects, or a
+        directory or glob of input files, all of them for the date received"""
+        if not isinstance(source, str):
+            return cls(source)
+        if os.path.isdir(source) or glob.has_magic(source):
+            if date is None:
+                raise VaccineManagementException(cls.MISSING_DATE_ERROR)
+            pattern = os.path.join(source, "*.json") if os.path.isdir(source) else source
+            return cls((input_file, date) for input_file in sorted(glob.glob(pattern)))
+        return cls(cls._manifest_requests(source))
+
+    @classmethod
+    def _manifest_requests(cls, manifest_file):
+        """Returns the requests of a manifest, relative to the folder of the manifest"""
+        try:
+            with open(manifest_file, "r", encoding="utf-8", newline="") as file:
+                manifest = json.load(file)
+        except FileNotFoundError as ex:
+            raise VaccineManagementException("File is not found") from ex
+        except json.JSONDecodeError as ex:
+            raise VaccineManagementException("JSON Decode Error - Wrong JSON Format") from ex
+        folder = os.path.dirname(manifest_file)
+        try:
+            return [(os.path.join(folder, request["input_file"]), request["date"])
+                    for request in manifest]
+        except (TypeError, KeyError) as ex:
+            raise VaccineManagementException(cls.BAD_MANIFEST_ERROR) from ex
+
+    @staticmethod
+    def _parse(input_file):
+        """Returns the parser of an input file, or the error of its format"""
+        try:
+            return AppointmentJsonParser(input_file)
+        except VaccineManagementException as exception_raised:
+            return exception_raised
+
+    def run(self):
+        """Returns every (input_file, date) request with its date_signature, or its
+        error, in the order of the requests"""
+        with ThreadPoolExecutor(self._read_threads) as executor:
+            parsers = list(executor.map(self._parse, [input_file for input_file, _
+                                                      in self._requests]))
+        results = [None] * len(self._requests)
+        appointments = []
+        for position, ((_, date), parser) in enumerate(zip(self._requests, parsers)):
+            if isinstance(parser, VaccineManagementException):
+                results[position] = parser
+                continue
+            try:
+                appointments.append(
+                    (position, VaccinationAppointment.create_appointment_from_parser(parser,
+                                                                                     date)))
+            except VaccineManagementException as exception_raised:
+                results[position] = exception_raised
+        store_results = AppointmentsJsonStore().add_items(
+            [appointment for _, appointment in appointments])
+        for (position, appointment), store_result in zip(appointments, store_results):
+            results[position] = appointment.date_signature if store_result.error is None \
+                else store_result.error
+        return list(zip(self._requests, results))
@@ -1,5 +1,33 @@
 """Global constants for finding the path"""
+import os
 from pathlib import Path
 JSON_FILES_PATH = str(Path.home()) + "/PycharmProjects/G50.2022.T07.FP/src/JsonFiles/"
 JSON_FILES_RF2_PATH = JSON_FILES_PATH + "/RF2/"
 JSON_FILES_FP_PATH = JSON_FILES_PATH + "/FP_cancel_appointment/"
+
+# Storage engine used by the stores: "json" files, "sharded" json files
+# (STORE_SHARDS files per store) or a "sqlite" database
+STORE_ENGINE = os.environ.get("UC3M_CARE_STORE_ENGINE", "json")
+STORE_SHARDS = int(os.environ.get("UC3M_CARE_STORE_SHARDS", "16"))
+SQLITE_FILE_PATH = JSON_FILES_PATH + "stores.db"
+
+# Durability of the store writes: "sync" returns once a change is on disk and
+# "buffered" writes the changes of STORE_COMMIT_WINDOW seconds together
+STORE_DURABILITY = os.environ.get("UC3M_CARE_STORE_DURABILITY", "sync")
+STORE_COMMIT_WINDOW = 0.05
+# Compaction of the store logs in a background thread instead of the writer's
+STORE_BACKGROUND_COMPACTION = True
+# Validation of the data of the stores kept in memory: "stat" checks the
+# signature of their files, "generation" a counter of the changes made by the
+# processes sharing them (files changed by other programs are not noticed)
+STORE_CACHE_VALIDATION = os.environ.get("UC3M_CARE_STORE_CACHE_VALIDATION", "stat")
+# Calls of the AsyncVaccineManager running at once in its executor
+ASYNC_MAX_CONCURRENCY = 8
+# Rows of a bulk registration file added to the store at once
+BULK_CHUNK_SIZE = 1000
+# Worker processes building the patients of a bulk registration (1: no pool)
+BULK_WORKERS = int(os.environ.get("UC3M_CARE_BULK_WORKERS", "1"))
+# Threads reading the input files of a batch of requests
+BATCH_READ_THREADS = 8
+# Patients kept by the cache of patients already verified against the store
+VERIFIED_PATIENTS_CACHE_SIZE = 4096
@@ -5,11 +5,20 @@ from uc3m_care.exception.vaccine_management_exception import VaccineManagementEx
 
 # pylint: disable=too-few-public-methods
 class Attribute:
-    """Class to abstract attributes"""
+    """Class to abstract attributes
+
+    The pattern of every subclass is compiled once, when the class is created.
+    The values can also be checked without raising, one by one with check or
+    by columns with check_columns, which returns an error per row."""
     _validation_pattern = r""
     _validation_error_message = ""
+    _compiled_pattern = re.compile(_validation_pattern)
     _value = ""
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compiled_pattern = re.compile(cls._validation_pattern)
+
     def __init__(self, attr_value):
         self._value = self._validate(attr_value)
 
@@ -24,8 +33,30 @@ class Attribute:
 
     def _validate(self, attr_value):
         """validates the attr_value """
-        registration_type_pattern = re.compile(self._validation_pattern)
-        res = registration_type_pattern.fullmatch(attr_value)
-        if not res:
-            raise VaccineManagementException(self._validation_error_message)
-        return attr_value
+        value, error = self.check(attr_value)
+        if isinstance(error, VaccineManagementException):
+            raise error
+        return value
+
+    @classmethod
+    def check(cls, attr_value):
+        """returns the valid value and None, or None and the error of the attr_value,
+        which is not valid if it is not a string"""
+        if not isinstance(attr_value, str) or not cls._compiled_pattern.fullmatch(attr_value):
+            return None, VaccineManagementException(cls._validation_error_message)
+        return attr_value, None
+
+    @staticmethod
+    def check_columns(columns):
+        """Checks columns of values by their Attribute subclass, returns the columns of
+        valid values (None where not valid) and the first error of every row, or None"""
+        valid_columns = {}
+        errors = None
+        for attribute, values in columns.items():
+            results = [attribute.check(value) for value in values]
+            valid_columns[attribute] = [value for value, _ in results]
+            column_errors = [error for _, error in results]
+            errors = column_errors if errors is None else \
+                [row_error if row_error is not None else error
+                 for row_error, error in zip(errors, column_errors)]
+        return valid_columns, errors or []
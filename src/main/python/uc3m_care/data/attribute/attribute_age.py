@@ -8,11 +8,11 @@ class Age(Attribute):
     """Class for the age attribute"""
     _validation_error_message = "age is not valid"
 
-    def _validate(self, attr_value: str) -> str:
-        """Validates the age according to the requirements"""
-        if attr_value.isnumeric():
-            if (int(attr_value) < 6 or int(attr_value) > 125):
-                raise VaccineManagementException(self._validation_error_message)
-        else:
-            raise VaccineManagementException(self._validation_error_message)
-        return attr_value
+    @classmethod
+    def check(cls, attr_value: str):
+        """Checks the age according to the requirements; only the decimal digits are
+        accepted, since int() fails with other numeric characters such as "½" """
+        if not isinstance(attr_value, str) or not attr_value.isdecimal() or \
+                not 6 <= int(attr_value) <= 125:
+            return None, VaccineManagementException(cls._validation_error_message)
+        return attr_value, None
@@ -9,10 +9,11 @@ class IsoDate(Attribute):
     _validation_pattern = r"^(20[0-9]{2})-(0[1-9]|1[0-2])-(0[1-9]|1[0-9]|2[0-9]|3[0-1])$"
     _validation_error_message = "IsoDate invalid"
 
-    def _validate(self, attr_value):
-        """Overrides the validate method of Attribute to include the ISO validation with datetime"""
+    @classmethod
+    def check(cls, attr_value):
+        """Overrides the check method of Attribute to include the ISO validation with datetime"""
         try:
             iso_date = date.fromisoformat(attr_value)
-        except ValueError as val_er:
-            raise VaccineManagementException("IsoDate invalid") from val_er
-        return super()._validate(iso_date.__str__())
+        except (ValueError, TypeError):
+            return None, VaccineManagementException("IsoDate invalid")
+        return super().check(iso_date.__str__())
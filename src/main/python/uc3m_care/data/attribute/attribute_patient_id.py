@@ -10,10 +10,11 @@ class PatientId(Attribute):
                           r"-[89ABab][0-9A-Fa-f]{3}-[0-9A-Fa-f]{12}$"
     _validation_error_message = "UUID invalid"
 
-    def _validate( self, attr_value ):
-        """overrides the validate method to include the valiation of  UUID values"""
+    @classmethod
+    def check( cls, attr_value ):
+        """overrides the check method to include the valiation of  UUID values"""
         try:
             patient_uuid = uuid.UUID(attr_value)
-        except ValueError as val_er:
-            raise VaccineManagementException("Id received is not a UUID") from val_er
-        return super()._validate(patient_uuid.__str__())
+        except (ValueError, TypeError, AttributeError):
+            return None, VaccineManagementException("Id received is not a UUID")
+        return super().check(patient_uuid.__str__())
@@ -0,0 +1,51 @@
+"""Contains the class Clock"""
+from datetime import datetime
+
+
+class Clock:
+    """Source of the current time of the objects of the system
+
+    The objects ask the clock returned by Clock.current() instead of reading
+    the time themselves, so a different one can be installed with
+    Clock.install, for instance a FixedClock in a test or a simulation."""
+    # pylint: disable=no-self-use
+    __current = None
+
+    @classmethod
+    def current(cls):
+        """Returns the clock installed"""
+        if cls.__current is None:
+            cls.__current = Clock()
+        return cls.__current
+
+    @classmethod
+    def install(cls, clock):
+        """Installs the clock received, returns the previous one"""
+        previous = cls.current()
+        cls.__current = clock
+        return previous
+
+    def utcnow(self):
+        """Returns the current UTC date and time"""
+        return datetime.utcnow()
+
+    def today(self):
+        """Returns the current local date and time"""
+        return datetime.today()
+
+    def timestamp(self):
+        """Returns the timestamp of the current UTC date and time"""
+        return datetime.timestamp(self.utcnow())
+
+
+class FixedClock(Clock):
+    """Clock whose current time is always the date and time received"""
+
+    def __init__(self, now):
+        self.__now = now
+
+    def utcnow(self):
+        return self.__now
+
+    def today(self):
+        return self.__now
@@ -1,7 +1,7 @@
 """Contains the class Vaccination Appointment"""
 from datetime import datetime
 import hashlib
-from freezegun import freeze_time
+from uc3m_care.data.clock import Clock
 from uc3m_care.data.attribute.attribute_phone_number import PhoneNumber
 from uc3m_care.data.attribute.attribute_patient_system_id import PatientSystemId
 from uc3m_care.data.attribute.attribute_date_signature import DateSignature
@@ -18,14 +18,18 @@ from uc3m_care.storage.appointments_json_store import AppointmentsJsonStore
 from uc3m_care.parser.appointment_json_parser import AppointmentJsonParser
 
 from uc3m_care.storage.cancellation_json_store import CancellationJsonStore
+from uc3m_care.storage.store_transaction import StoreTransaction
 from uc3m_care.data.vaccination_cancellation import VaccinationCancellation
 
 
 # pylint: disable=too-many-instance-attributes
 class VaccinationAppointment:
     """Class representing an appointment for the vaccination of a patient"""
+    MANIPULATED_ERROR = "Appointment's data have been manipulated"
 
-    def __init__(self, patient_sys_id, patient_phone_number, days):
+    def __init__(self, patient_sys_id, patient_phone_number, days, issued_at=None):
+        """The issued_at of an appointment already stored rebuilds its date_signature,
+        the new appointments are issued at the time of the clock"""
         self.__alg = "SHA-256"
         self.__type = "DS"
         self.__patient_sys_id = PatientSystemId(patient_sys_id).value
@@ -33,8 +37,7 @@ class VaccinationAppointment:
             self.__patient_sys_id)
         self.__patient_id = patient.patient_id
         self.__phone_number = PhoneNumber(patient_phone_number).value
-        justnow = datetime.utcnow()
-        self.__issued_at = datetime.timestamp(justnow)
+        self.__issued_at = Clock.current().timestamp() if issued_at is None else issued_at
         if days == 0:
             self.__appointment_date = 0
         else:
@@ -105,38 +108,87 @@ class VaccinationAppointment:
         appointments_store = AppointmentsJsonStore()
         appointments_store.add_item(self)
 
-    def erase_appointment(self):
+    def erase_appointment(self, transaction):
+        """erases the appointment from the appointments store in the transaction"""
         appointments_store = AppointmentsJsonStore()
-        appointments_store.erase_item(self.__date_signature)
+        transaction.erase_item(appointments_store, self.__date_signature)
 
 
     @classmethod
-    def get_appointment_from_date_signature(cls, date_signature):
-        """returns the vaccination appointment object for the date_signature received"""
+    def get_appointment_from_date_signature(cls, date_signature, verify=True):
+        """returns the vaccination appointment object for the date_signature received,
+        checking its integrity unless verify is False, for the callers that verify
+        many appointments at once"""
         appointments_store = AppointmentsJsonStore()
         appointment_record = appointments_store.find_item(DateSignature(date_signature).value)
         if appointment_record is None:
             raise VaccineManagementException("date_signature is not found")
-        issued_at = datetime.fromtimestamp(appointment_record["_VaccinationAppointment__issued_at"])
-
-        freezer = freeze_time(issued_at)
+        appointment = cls.from_record(appointment_record)
+        if verify:
+            appointment.verify()
+        return appointment
 
-        # Computes days between issuance and vaccination day
-        appointment_date = datetime.fromtimestamp(appointment_record['_VaccinationAppointment__appointment_date'])
-        days_left = (appointment_date - issued_at).days
+    @classmethod
+    def from_record(cls, record):
+        """Returns the appointment of a record of the appointments store as it is stored,
+        without checking it against the patients store or its signature"""
+        appointment = cls.__new__(cls)
+        appointment._set_fields(record)
+        return appointment
 
-        freezer.start()
+    def _set_fields(self, record):
+        """Sets the fields of the appointment to the ones of a record"""
+        self.__alg = record["_VaccinationAppointment__alg"]
+        self.__type = record["_VaccinationAppointment__type"]
+        self.__patient_sys_id = record["_VaccinationAppointment__patient_sys_id"]
+        self.__patient_id = record["_VaccinationAppointment__patient_id"]
+        self.__phone_number = record["_VaccinationAppointment__phone_number"]
+        self.__issued_at = record["_VaccinationAppointment__issued_at"]
+        self.__appointment_date = record["_VaccinationAppointment__appointment_date"]
+        self.__date_signature = record["_VaccinationAppointment__date_signature"]
 
-        appointment = cls(appointment_record["_VaccinationAppointment__patient_sys_id"],
-                          appointment_record["_VaccinationAppointment__phone_number"], days_left)
-        freezer.stop()
-        return appointment
+    @classmethod
+    def verify_appointments(cls, appointments):
+        """Checks many appointments looking up each of their patients once, returns
+        the error of every appointment that is not valid by its date_signature"""
+        errors = {}
+        patients = {}
+        for appointment in appointments:
+            try:
+                appointment.verify(patients)
+            except VaccineManagementException as exception_raised:
+                errors[appointment.date_signature] = exception_raised
+        return errors
+
+    def verify(self, patients=None):
+        """Checks the signature of the appointment and its patient in the patients store;
+        patients keeps the patients (or their errors) already looked up by sys_id"""
+        if patients is None:
+            patients = {}
+        if self.vaccination_signature != self.__date_signature:
+            raise VaccineManagementException(self.MANIPULATED_ERROR)
+        if self.__patient_sys_id not in patients:
+            try:
+                patients[self.__patient_sys_id] = \
+                    VaccinePatientRegister.create_patient_from_patient_system_id(
+                        self.__patient_sys_id)
+            except VaccineManagementException as exception_raised:
+                patients[self.__patient_sys_id] = exception_raised
+        patient = patients[self.__patient_sys_id]
+        if isinstance(patient, VaccineManagementException):
+            raise VaccineManagementException(patient.message)
+        if patient.patient_id != self.__patient_id:
+            raise VaccineManagementException(self.MANIPULATED_ERROR)
+        return True
 
     @classmethod
     def create_appointment_from_json_file(cls, json_file, date: str):
         """Returns the vaccination appointment for the received input json file"""
+        return cls.create_appointment_from_parser(AppointmentJsonParser(json_file), date)
 
-        appointment_parser = AppointmentJsonParser(json_file)
+    @classmethod
+    def create_appointment_from_parser(cls, appointment_parser, date: str):
+        """Returns the vaccination appointment for an input json file already parsed"""
         iso_date = IsoDate(date)
         # Checks appointment date is after today
         VaccinationAppointment.is_date_less_equal_today(iso_date)
@@ -152,16 +204,16 @@ class VaccinationAppointment:
 
     @classmethod
     def days_left(cls, date: IsoDate):
-        return (datetime.strptime(date.value, '%Y-%m-%d') - datetime.today()).days
+        return (datetime.strptime(date.value, '%Y-%m-%d') - Clock.current().today()).days
 
     @classmethod
     def is_date_less_equal_today(cls, date: IsoDate):
-        if datetime.strptime(date.value, '%Y-%m-%d') <= datetime.today():
+        if datetime.strptime(date.value, '%Y-%m-%d') <= Clock.current().today():
             raise VaccineManagementException("Fecha igual o anterior a la actual")
 
     def is_valid_today(self):
         """returns true if today is the appointment's date"""
-        today = datetime.today().date()
+        today = Clock.current().today().date()
         date_patient = datetime.fromtimestamp(self.appointment_date).date()
         if date_patient != today:
             raise VaccineManagementException("Today is not the date")
@@ -179,12 +231,23 @@ class VaccinationAppointment:
     def cancel_appointment_from_json_file(cls, json_file):
 
         cancellation = VaccinationCancellation.create_cancellation_from_json_file(json_file)
+        appointment = cls.appointment_to_cancel(cancellation)
 
+        # The three changes are committed together at the end of the block
+        with StoreTransaction() as transaction:
+            appointment.cancel_appointment(cancellation, transaction)
+
+        return cancellation.date_signature
+
+    @classmethod
+    def appointment_to_cancel(cls, cancellation, verify=True):
+        """Returns the appointment of the cancellation, checking it can be cancelled"""
         # Search for the appointment in store_date
-        appointment = VaccinationAppointment.get_appointment_from_date_signature(cancellation.date_signature)
+        appointment = VaccinationAppointment.get_appointment_from_date_signature(
+            cancellation.date_signature, verify)
 
         # Checks date is posterior to today
-        if appointment.appointment_date < datetime.timestamp(datetime.today()):
+        if appointment.appointment_date < datetime.timestamp(Clock.current().today()):
             raise VaccineManagementException("The appointment date has already passed")
 
         # Searches in store_vaccine in case the vaccine was already administered
@@ -197,13 +260,14 @@ class VaccinationAppointment:
         cancellation_storage = CancellationJsonStore()
         if cancellation_storage.find_item(cancellation.date_signature) is not None:
             raise VaccineManagementException("The appointment was already cancelled")
+        return appointment
 
+    def cancel_appointment(self, cancellation, transaction):
+        """Cancels the appointment in the transaction"""
         # Erases the appointment in store_date
-        appointment.erase_appointment()
+        self.erase_appointment(transaction)
 
-        cancellation.log_cancelled_appointment(appointment)
+        cancellation.log_cancelled_appointment(self, transaction)
 
         # Adds cancellation to store_cancellation
-        cancellation_storage.add_item(cancellation)
-
-        return cancellation.date_signature
+        transaction.add_item(CancellationJsonStore(), cancellation)
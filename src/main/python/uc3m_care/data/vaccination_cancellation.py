@@ -1,4 +1,5 @@
 """File for the VaccinationCancellation class"""
+from uc3m_care.data.attribute.attribute import Attribute
 from uc3m_care.data.attribute.attribute_date_signature import DateSignature
 from uc3m_care.data.attribute.attribute_cancellation_type import CancellationType
 from uc3m_care.data.attribute.attribute_reason import Reason
@@ -20,7 +21,11 @@ class VaccinationCancellation:
     @classmethod
     def create_cancellation_from_json_file(cls, json_file):
         # Parse keys
-        cancellation_parser = CancellationJsonParser(json_file)
+        return cls.create_cancellation_from_parser(CancellationJsonParser(json_file))
+
+    @classmethod
+    def create_cancellation_from_parser(cls, cancellation_parser):
+        """Returns the cancellation for an input already parsed"""
         content = cancellation_parser.json_content
 
         # Creates cancellation object
@@ -30,13 +35,42 @@ class VaccinationCancellation:
 
         return cancellation
 
-    def log_cancelled_appointment(self, appointment):
+    @classmethod
+    def create_cancellations_from_parsers(cls, cancellation_parsers):
+        """Returns the cancellation, or the error, of every input already parsed, checking
+        their values by columns"""
+        keys = [CancellationJsonParser.DATE_SIGNATURE_KEY,
+                CancellationJsonParser.CANCELLATION_TYPE_KEY,
+                CancellationJsonParser.REASON_KEY]
+        attributes = [DateSignature, CancellationType, Reason]
+        values, errors = Attribute.check_columns(
+            {attribute: [parser.json_content[key] for parser in cancellation_parsers]
+             for attribute, key in zip(attributes, keys)})
+        cancellations = []
+        for row, error in enumerate(errors):
+            if error is not None:
+                cancellations.append(error)
+                continue
+            cancellation = cls.__new__(cls)
+            cancellation._set_fields(values[DateSignature][row],
+                                     values[CancellationType][row], values[Reason][row])
+            cancellations.append(cancellation)
+        return cancellations
+
+    def _set_fields(self, date_signature, cancellation_type, reason):
+        """Sets the fields of the cancellation to values already checked"""
+        self.__date_signature = date_signature
+        self.__cancellation_type = cancellation_type
+        self.__reason = reason
+
+    def log_cancelled_appointment(self, appointment, transaction):
+        """Adds the appointment to the store of its cancellation type in the transaction"""
         if self.__cancellation_type == 'Temporal':
             storage = TemporalCancelledAppointmentJsonStore()
-            storage.add_item(appointment)
+            transaction.add_item(storage, appointment)
         elif self.__cancellation_type == 'Final':
             storage = FinalCancelledAppointmentJsonStore()
-            storage.add_item(appointment)
+            transaction.add_item(storage, appointment)
 
     @property
     def date_signature(self):
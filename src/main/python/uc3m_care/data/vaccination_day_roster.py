@@ -0,0 +1,84 @@
+"""Contains the class VaccinationDayRoster"""
+from datetime import datetime
+
+from uc3m_care.data.attribute.attribute_date_signature import DateSignature
+from uc3m_care.data.clock import Clock
+from uc3m_care.data.vaccination_appointment import VaccinationAppointment
+from uc3m_care.data.vaccination_log import VaccinationLog
+from uc3m_care.storage.appointments_json_store import AppointmentsJsonStore
+from uc3m_care.storage.vaccination_json_store import VaccinationJsonStore
+
+
+class VaccinationDayRoster:
+    """Appointments of a vaccination day, loaded and verified when the day starts
+
+    Checking in a patient of the roster is a dictionary lookup, and its
+    vaccination is logged with the buffered durability, so the entries of a
+    busy desk are synced to disk together; closing the roster (or leaving its
+    with block) flushes them. The appointments that are not in the roster,
+    such as the ones made after it was loaded, are checked in as by
+    vaccine_patient. The appointments that could not be verified are kept
+    in rejected with their error. If the appointments store changed after
+    the roster was loaded, an appointment is checked in only if it is still
+    in the store, so the cancelled ones are not."""
+
+    def __init__(self):
+        self.__day = Clock.current().today().date()
+        self.__appointments = {}
+        appointments_store = AppointmentsJsonStore()
+        # the version is read first, so the changes made while loading are noticed
+        self.__version = appointments_store.data_version()
+        for record in appointments_store.iter_items(self.__is_appointment_of_the_day):
+            appointment = VaccinationAppointment.from_record(record)
+            self.__appointments[appointment.date_signature] = appointment
+        self.__rejected = VaccinationAppointment.verify_appointments(
+            self.__appointments.values())
+        for date_signature in self.__rejected:
+            del self.__appointments[date_signature]
+
+    def __is_appointment_of_the_day(self, record):
+        """Checks if the record of the appointments store is for the day of the roster"""
+        appointment_date = record["_VaccinationAppointment__appointment_date"]
+        return appointment_date != 0 and \
+            datetime.fromtimestamp(appointment_date).date() == self.__day
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def day(self):
+        """Returns the day of the roster"""
+        return self.__day
+
+    @property
+    def appointments(self):
+        """Returns the verified appointments of the roster by date_signature"""
+        return self.__appointments
+
+    @property
+    def rejected(self):
+        """Returns the error of the appointments that could not be verified"""
+        return self.__rejected
+
+    def check_in(self, date_signature):
+        """Registers the vaccination of the patient of the appointment"""
+        date_signature = DateSignature(date_signature).value
+        appointment = self.__appointments.get(date_signature)
+        appointments_store = AppointmentsJsonStore()
+        if appointment is not None and \
+                appointments_store.data_version() != self.__version and \
+                appointments_store.find_item(date_signature) is None:
+            appointment = None
+        if appointment is None or self.__day != Clock.current().today().date():
+            appointment = VaccinationAppointment.get_appointment_from_date_signature(
+                date_signature)
+            appointment.is_valid_today()
+        VaccinationJsonStore().add_item(VaccinationLog(date_signature), buffered=True)
+        return True
+
+    def close(self):
+        """Writes to disk the vaccinations registered"""
+        VaccinationJsonStore().flush()
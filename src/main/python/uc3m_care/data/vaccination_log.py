@@ -1,5 +1,5 @@
 """Class representing an entry of the vaccine administration log"""
-from datetime import datetime
+from uc3m_care.data.clock import Clock
 from uc3m_care.storage.vaccination_json_store import VaccinationJsonStore
 
 
@@ -9,7 +9,7 @@ class VaccinationLog:
 
     def __init__(self, date_signature):
         self.__date_signature = date_signature
-        self.__timestamp = datetime.timestamp(datetime.utcnow())
+        self.__timestamp = Clock.current().timestamp()
 
     def save_log_entry(self):
         """saves the entry in the vaccine administration log"""
@@ -1,11 +1,13 @@
 """MODULE: access_request. Contains the access request class"""
+import copy
 import hashlib
 import json
 
-from datetime import datetime
-from freezegun import freeze_time
-
+from uc3m_care.cfg.vaccine_manager_config import VERIFIED_PATIENTS_CACHE_SIZE
+from uc3m_care.data.clock import Clock
+from uc3m_care.data.verified_patients_cache import VerifiedPatientsCache
 from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
+from uc3m_care.data.attribute.attribute import Attribute
 from uc3m_care.data.attribute.attribute_registration_type import RegistrationType
 from uc3m_care.data.attribute.attribute_patient_id import PatientId
 from uc3m_care.data.attribute.attribute_phone_number import PhoneNumber
@@ -16,41 +18,75 @@ from uc3m_care.storage.patients_json_store import PatientsJsonStore
 
 class VaccinePatientRegister:
     """Class representing the register of the patient in the system"""
+    _verified_patients = VerifiedPatientsCache(VERIFIED_PATIENTS_CACHE_SIZE)
+
     #pylint: disable=too-many-arguments
-    def __init__( self, patient_id, full_name, registration_type, phone_number, age ):
-        self.__patient_id = PatientId(patient_id).value
-        self.__full_name = FullName(full_name).value
-        self.__registration_type = RegistrationType(registration_type).value
-        self.__phone_number = PhoneNumber(phone_number).value
-        self.__age = Age(age).value
-        justnow = datetime.utcnow()
-        self.__time_stamp = datetime.timestamp(justnow)
+    def __init__( self, patient_id, full_name, registration_type, phone_number, age,
+                  time_stamp=None ):
+        """The time_stamp of a patient already registered rebuilds its patient_sys_id,
+        the new patients are stamped by the clock"""
+        self.__set_values(PatientId(patient_id).value, FullName(full_name).value,
+                          RegistrationType(registration_type).value,
+                          PhoneNumber(phone_number).value, Age(age).value, time_stamp)
+
+    def __set_values( self, patient_id, full_name, registration_type, phone_number, age,
+                      time_stamp ):
+        """Sets the values already validated and signs them"""
+        self.__patient_id = patient_id
+        self.__full_name = full_name
+        self.__registration_type = registration_type
+        self.__phone_number = phone_number
+        self.__age = age
+        self.__time_stamp = Clock.current().timestamp() if time_stamp is None else time_stamp
         #self.__time_stamp = 1645542405.232003
         self.__patient_sys_id =  hashlib.md5(self.__str__().encode()).hexdigest()
 
+    @classmethod
+    def create_patients( cls, rows ):
+        """returns the new patient, or the error, of every row of (patient_id, full_name,
+        registration_type, phone_number, age) values, which are checked by columns"""
+        if not rows:
+            return []
+        columns = list(zip(*rows))
+        attributes = [PatientId, FullName, RegistrationType, PhoneNumber, Age]
+        values, errors = Attribute.check_columns(dict(zip(attributes, columns)))
+        patients = []
+        for row, error in enumerate(errors):
+            if error is not None:
+                patients.append(error)
+                continue
+            patient = cls.__new__(cls)
+            patient.__set_values(*[values[attribute][row] for attribute in attributes], None)
+            patients.append(patient)
+        return patients
+
     @classmethod
     def create_patient_from_patient_system_id( cls, patient_system_id ):
-        """returns the VaccinePatientRegister object for the patient_system_id received"""
+        """returns the VaccinePatientRegister object for the patient_system_id received
+
+        The patients verified are cached until the patients store changes"""
         patient_store = PatientsJsonStore()
+        # the version is read first, so a change made meanwhile is not cached with it
+        store_version = patient_store.data_version()
+        patient = cls._verified_patients.get(patient_system_id, store_version)
+        if patient is not None:
+            return copy.copy(patient)
 
         patient_found = patient_store.find_item(patient_system_id)
         if patient_found is None:
             raise VaccineManagementException("patient_system_id not found")
 
-        # set the date when the patient was registered for checking the md5
-        freezer = freeze_time(
-            datetime.fromtimestamp(patient_found["_VaccinePatientRegister__time_stamp"]).date())
-        freezer.start()
         patient = cls(patient_found["_VaccinePatientRegister__patient_id"],
                       patient_found["_VaccinePatientRegister__full_name"],
                       patient_found["_VaccinePatientRegister__registration_type"],
                       patient_found["_VaccinePatientRegister__phone_number"],
-                      patient_found["_VaccinePatientRegister__age"])
-        freezer.stop()
+                      patient_found["_VaccinePatientRegister__age"],
+                      patient_found["_VaccinePatientRegister__time_stamp"])
         if patient.patient_system_id != patient_system_id:
             raise VaccineManagementException("Patient's data have been manipulated")
 
-        return patient
+        cls._verified_patients.put(patient, store_version)
+        return copy.copy(patient)
 
 
     def __str__(self):
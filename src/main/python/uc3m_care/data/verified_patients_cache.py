@@ -0,0 +1,48 @@
+"""Contains the class VerifiedPatientsCache"""
+import threading
+from collections import OrderedDict
+
+
+class VerifiedPatientsCache:
+    """LRU cache of the patients already verified against the patients store
+
+    The patients are kept by patient_sys_id together with the version of the
+    store they were verified against; when the version of the store changes
+    the whole cache is dropped, so a patient changed in the store is verified
+    again. Only the maxsize patients used most recently are kept."""
+
+    def __init__(self, maxsize):
+        self.__maxsize = maxsize
+        self.__patients = OrderedDict()
+        self.__version = None
+        self.__lock = threading.Lock()
+
+    def get(self, patient_sys_id, version):
+        """Returns the patient verified with the store in that version, or None"""
+        with self.__lock:
+            if version != self.__version:
+                return None
+            patient = self.__patients.get(patient_sys_id)
+            if patient is not None:
+                self.__patients.move_to_end(patient_sys_id)
+            return patient
+
+    def put(self, patient, version):
+        """Keeps a patient verified with the store in that version"""
+        with self.__lock:
+            if version != self.__version:
+                self.__patients.clear()
+                self.__version = version
+            self.__patients[patient.patient_sys_id] = patient
+            self.__patients.move_to_end(patient.patient_sys_id)
+            if len(self.__patients) > self.__maxsize:
+                self.__patients.popitem(last=False)
+
+    def clear(self):
+        """Drops all the patients"""
+        with self.__lock:
+            self.__patients.clear()
+            self.__version = None
+
+    def __len__(self):
+        return len(self.__patients)
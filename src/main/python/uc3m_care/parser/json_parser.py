@@ -14,8 +14,19 @@ class JsonParser:
         self.load_json_content()
         self.validate_json_keys()
 
+    @classmethod
+    def from_json_content(cls, json_content):
+        """Returns the parser of a content already decoded, such as a line of a JSONL file"""
+        parser = cls.__new__(cls)
+        parser._input_file = None
+        parser._json_content = json_content
+        parser.validate_json_keys()
+        return parser
+
     def validate_json_keys(self):
         """Validates the keys stored in JSON_KEYS list"""
+        if not isinstance(self._json_content, dict):
+            raise VaccineManagementException("JSON Decode Error - Wrong JSON Format")
         for key, error_message in zip(self._JSON_KEYS, self._ERROR_MESSAGES):
             if key not in self._json_content.keys():
                 raise VaccineManagementException(error_message)
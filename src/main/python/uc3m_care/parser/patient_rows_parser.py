@@ -0,0 +1,63 @@
+"""Parser of the CSV and JSONL files with the patients of a bulk registration"""
+import csv
+import json
+import os
+from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
+
+
+class PatientRowsParser:
+    """Reads lazily the rows of a CSV file (with a header) or a JSONL file
+
+    Each row is returned as its number (the first one is 1) and a dictionary
+    with the ROW_KEYS, or the VaccineManagementException raised by its format."""
+    PATIENT_ID_KEY = "patient_id"
+    FULL_NAME_KEY = "full_name"
+    REGISTRATION_TYPE_KEY = "registration_type"
+    PHONE_NUMBER_KEY = "phone_number"
+    AGE_KEY = "age"
+    ROW_KEYS = [PATIENT_ID_KEY, FULL_NAME_KEY, REGISTRATION_TYPE_KEY, PHONE_NUMBER_KEY, AGE_KEY]
+    BAD_LABEL_ERROR = "Bad label "
+    JSONL_EXTENSIONS = [".jsonl", ".ndjson"]
+
+    def __init__(self, input_file):
+        self._input_file = input_file
+
+    def rows(self):
+        """Yields the number and the content, or the error, of every row of the file"""
+        try:
+            with open(self._input_file, "r", encoding="utf-8", newline="") as file:
+                if os.path.splitext(self._input_file)[1].lower() in self.JSONL_EXTENSIONS:
+                    yield from self._jsonl_rows(file)
+                else:
+                    yield from self._csv_rows(file)
+        except FileNotFoundError as ex:
+            raise VaccineManagementException("File is not found") from ex
+
+    def _csv_rows(self, file):
+        """Yields the rows of a CSV file"""
+        for row_number, row in enumerate(csv.DictReader(file), 1):
+            yield row_number, self._validate_row(row)
+
+    def _jsonl_rows(self, file):
+        """Yields the rows of a JSONL file, skipping the blank lines"""
+        row_number = 0
+        for line in file:
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                row = None
+            if not isinstance(row, dict):
+                yield row_number, VaccineManagementException(
+                    "JSON Decode Error - Wrong JSON Format")
+                continue
+            yield row_number, self._validate_row(row)
+
+    def _validate_row(self, row):
+        """Returns the values of the row as strings, or the error of a missing key"""
+        for key in self.ROW_KEYS:
+            if row.get(key) is None:
+                return VaccineManagementException(self.BAD_LABEL_ERROR + key)
+        return {key: str(row[key]) for key in self.ROW_KEYS}
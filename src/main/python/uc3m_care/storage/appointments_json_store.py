@@ -1,37 +1,28 @@
 """Subclass of JsonStore for managing the Appointments"""
 
-from uc3m_care.storage.json_store import JsonStore
+from uc3m_care.storage.store_engine import store_engine
+from uc3m_care.storage.singleton_store import SingletonStore
+from uc3m_care.storage.record_schema import APPOINTMENT_SCHEMA
 from uc3m_care.cfg.vaccine_manager_config import JSON_FILES_PATH
 from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
 
 
-class AppointmentsJsonStore:
+class AppointmentsJsonStore(SingletonStore):
     """Implements the singleton pattern"""
 
-    # pylint: disable=invalid-name
-    class __AppointmentsJsonStore(JsonStore):
+    # pylint: disable=invalid-name, too-few-public-methods
+    class __AppointmentsJsonStore(store_engine()):
         """Subclass of JsonStore for managing the Appointments"""
         _FILE_PATH = JSON_FILES_PATH + "store_date.json"
         _ID_FIELD = "_VaccinationAppointment__date_signature"
+        _RECORD_SCHEMA = APPOINTMENT_SCHEMA
         ERROR_INVALID_APPOINTMENT_OBJECT = "Invalide appointment object"
 
-        def add_item(self, item):
-            """Overrides the add_item method to verify the item to be stored"""
+        def _validate_item(self, item):
+            """Overrides the _validate_item method to verify the item to be stored"""
             # pylint: disable=import-outside-toplevel, cyclic-import
             from uc3m_care.data.vaccination_appointment import VaccinationAppointment
             if not isinstance(item, VaccinationAppointment):
                 raise VaccineManagementException(self.ERROR_INVALID_APPOINTMENT_OBJECT)
-            super().add_item(item)
 
-    instance = None
-
-    def __new__(cls):
-        if not AppointmentsJsonStore.instance:
-            AppointmentsJsonStore.instance = AppointmentsJsonStore.__AppointmentsJsonStore()
-        return AppointmentsJsonStore.instance
-
-    def __getattr__(self, name):
-        return getattr(self.instance, name)
-
-    def __setattr__(self, name, value):
-        return setattr(self.instance, name, value)
+    _STORE_CLASS = __AppointmentsJsonStore
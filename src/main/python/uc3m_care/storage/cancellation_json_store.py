@@ -1,26 +1,18 @@
 """Subclass of JsonStore for managing the Cancellation store"""
-from uc3m_care.storage.json_store import JsonStore
+from uc3m_care.storage.store_engine import store_engine
+from uc3m_care.storage.singleton_store import SingletonStore
+from uc3m_care.storage.record_schema import CANCELLATION_SCHEMA
 from uc3m_care.cfg.vaccine_manager_config import JSON_FILES_PATH
 
 
-class CancellationJsonStore:
+class CancellationJsonStore(SingletonStore):
     """Implements the singleton pattern"""
 
-    # pylint: disable=invalid-name
-    class __CancellationJsonStore(JsonStore):
+    # pylint: disable=invalid-name, too-few-public-methods
+    class __CancellationJsonStore(store_engine()):
         """Subclass of JsonStore for managing the cancellations file"""
         _FILE_PATH = JSON_FILES_PATH + "store_cancellation.json"
         _ID_FIELD = "_VaccinationCancellation__date_signature"
+        _RECORD_SCHEMA = CANCELLATION_SCHEMA
 
-    instance = None
-
-    def __new__(cls):
-        if not CancellationJsonStore.instance:
-            CancellationJsonStore.instance = CancellationJsonStore.__CancellationJsonStore()
-        return CancellationJsonStore.instance
-
-    def __getattr__(self, name):
-        return getattr(self.instance, name)
-
-    def __setattr__(self, name, value):
-        return setattr(self.instance, name, value)
+    _STORE_CLASS = __CancellationJsonStore
@@ -1,81 +1,1031 @@
 """Superclass for managing storage in JSON files"""
+import atexit
+import bisect
 import hashlib
 import json
 import os
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
 
+from uc3m_care.cfg.vaccine_manager_config import STORE_DURABILITY, STORE_COMMIT_WINDOW, \
+    STORE_BACKGROUND_COMPACTION, STORE_CACHE_VALIDATION
 from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
+from uc3m_care.storage.record_schema import RecordSchema
+from uc3m_care.storage.store_lock import StoreLock
 
+# result of adding an item in a batch: error is None if it was added
+ItemResult = namedtuple("ItemResult", ["item", "error"])
+
+# pylint: disable=too-many-instance-attributes, too-many-public-methods
 class JsonStore:
-    """Superclass for managing storage in JSON files"""
+    """Superclass for managing storage in JSON files
+
+    The file in _FILE_PATH holds a snapshot of the store as a JSON list. Items
+    added or erased after that snapshot are appended as single JSON lines to
+    the log file (_FILE_PATH + ".log"), so a write never rewrites the whole
+    store; erasing an item appends a tombstone. When the log outgrows the
+    snapshot, or too many of the records in the files are erased ones, the
+    store is compacted into a new snapshot, in a background thread if
+    _BACKGROUND_COMPACTION is set.
+
+    The data list is kept in memory while the signature (inode, size and
+    modification time) of both files does not change. With the "generation"
+    cache validation it is kept while the counter of changes in the lock file
+    does not change, which only notices the changes made through a JsonStore.
+
+    The files are shared by several processes: they are read holding a
+    shared lock on the lock file (_FILE_PATH + ".lock") and changed holding
+    an exclusive one.
+
+    The stores with a _RECORD_SCHEMA keep their records as compact Records,
+    written to the files as lists of values (see RecordSchema).
+
+    The items are indexed in memory by _ID_FIELD and by the fields declared in
+    _INDEX_FIELDS, so looking them up does not scan the data list.
+
+    The store can be shared by threads: the changes are made holding a lock,
+    while the lookups take no lock when the files have not changed. The
+    records are never modified and the index entries are tuples replaced on
+    every change, so a lookup reads a consistent snapshot of them; it only
+    takes the lock to look again if a record it found was erased meanwhile.
+
+    Changes to several stores can be committed together by commit_transaction,
+    which writes them first to a journal shared by the stores of the folder.
+    The journal only holds the transaction being committed: a transaction
+    left there by a crash is applied when the stores are first loaded.
+
+    The log entries are written by group commit: with the "sync" durability an
+    add or erase returns once its entry is synced to disk, and the entries of
+    the threads waiting for the same sync are written at once; with the
+    "buffered" durability they are kept in memory and written together after
+    _COMMIT_WINDOW seconds or when flush is called.
+    """
     _FILE_PATH = ""
     _ID_FIELD = ""
-    _data_list = []
+    _INDEX_FIELDS = []
+    _RECORD_SCHEMA = None
+    # the validation of an item looks up the items of the store
+    _VALIDATES_AGAINST_ITEMS = False
+    _DIGEST_MODULUS = 2 ** 128
+    _LOG_SUFFIX = ".log"
+    _LOCK_SUFFIX = ".lock"
+    _CACHE_VALIDATION = STORE_CACHE_VALIDATION
+    # the log is compacted when it is bigger than the snapshot and this size,
+    # or when this ratio of the records in the files are erased ones
+    _COMPACTION_MIN_BYTES = 64 * 1024
+    _COMPACTION_DEAD_RATIO = 0.5
+    _COMPACTION_MIN_DEAD = 1000
+    _BACKGROUND_COMPACTION = STORE_BACKGROUND_COMPACTION
+    _DURABILITY = STORE_DURABILITY
+    _COMMIT_WINDOW = STORE_COMMIT_WINDOW
+    _JOURNAL_FILE = "store_transactions.journal"
+    # journals recovered, or being recovered, by this process
+    _recovered_journals = set()
+    _recovery_lock = threading.Lock()
+    # thread and file locks of the journals by path
+    _journal_locks = {}
+    # items by position, in the order they were added
+    _records = {}
+    _next_position = 0
+    _indexes = {}
+    # sum of the digests of the records, kept as they are added and erased
+    _digest = 0
+    # records in the snapshot and entries in the log
+    _snapshot_records = 0
+    _log_additions = 0
+    _log_tombstones = 0
+    _compaction_thread = None
+    # signature of the files when they were loaded and bytes of the log applied
+    _cache_signature = None
+    _log_offset = None
+    # counter of changes of the lock file when the files were loaded
+    _generation = None
 
-    def __init__(self):
-        self.load()
+    # pylint: disable=too-many-arguments
+    def __init__(self, file_path=None, id_field=None, index_fields=None, record_schema=None):
+        # the store can be given the class attributes of its files when it is created
+        # pylint: disable=invalid-name
+        if file_path is not None:
+            self._FILE_PATH = file_path
+        if id_field is not None:
+            self._ID_FIELD = id_field
+        if index_fields is not None:
+            self._INDEX_FIELDS = index_fields
+        if record_schema is not None:
+            self._RECORD_SCHEMA = record_schema
+        # log entries not written yet and counters of the appended, written and synced ones
+        self._pending = []
+        self._appended_count = 0
+        self._synced_count = 0
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._flush_timer = None
+        # the files are not read until the store is used
+        self._store_lock = StoreLock(self._FILE_PATH + self._LOCK_SUFFIX)
+
+    @property
+    def _data_list(self):
+        """Returns the items of the store in the order they were added"""
+        if self._cache_signature is None:
+            self.load()
+        return list(self._records.values())
+
+    @property
+    def _log_path(self):
+        """Path of the log file with the changes made after the snapshot"""
+        return self._FILE_PATH + self._LOG_SUFFIX
+
+    @property
+    def _journal_path(self):
+        """Path of the transactions journal of the stores in the same folder"""
+        return os.path.join(os.path.dirname(self._FILE_PATH), self._JOURNAL_FILE)
+
+    @contextmanager
+    def _locked(self, exclusive=True):
+        """Locks the store for the threads of this process and for the other processes"""
+        with self._write_lock:
+            self._store_lock.acquire(exclusive)
+            try:
+                yield
+            finally:
+                self._store_lock.release()
+
+    def _count_change(self):
+        """Counts a change of the files in the lock file, the process is up to date with it"""
+        generation = self._store_lock.increase_generation()
+        if self._generation is not None:
+            self._generation = generation
+
+    @staticmethod
+    def _file_signature(path):
+        """Returns the inode, size and modification time of a file, None if it does not exist"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _log_header(snapshot_signature):
+        """Identifies the snapshot the log entries are applied to"""
+        if snapshot_signature is None:
+            return {"snapshot": None}
+        return {"snapshot": [snapshot_signature[1], snapshot_signature[2]]}
 
     def load(self):
-        """Loading data into the data list"""
+        """Loading data into the data list: the snapshot plus the log replayed on it
+
+        The files are only read again when their signature has changed since
+        the last load; if only the log has grown, just the new entries are read."""
+        if self._cache_is_valid():
+            return
+        self.recover_transactions()
+        with self._locked(exclusive=False):
+            self._load_changes()
+
+    def _cache_is_valid(self):
+        """Checks, without locking, if the data in memory is up to date with the files"""
+        if self._cache_signature is None:
+            return False
+        if self._CACHE_VALIDATION == "generation":
+            generation = self._store_lock.generation()
+            if generation is not None:
+                return generation == self._generation
+        return (self._file_signature(self._FILE_PATH),
+                self._file_signature(self._log_path)) == self._cache_signature
+
+    def _load_changes(self, check_files=False):
+        """Loads the changes in the files since the last load, checking their
+        signature if check_files is set whatever the cache validation is"""
+        generation = None
+        if self._CACHE_VALIDATION == "generation":
+            generation = self._store_lock.generation()
+            if generation is not None and generation == self._generation and \
+                    self._cache_signature is not None and not check_files:
+                return
+        self._generation = generation
+        signature = (self._file_signature(self._FILE_PATH),
+                     self._file_signature(self._log_path))
+        if signature == self._cache_signature:
+            return
+        offset = None
+        if self._cache_signature is not None and signature[0] == self._cache_signature[0]:
+            # the snapshot is the same, so only the log has to be read
+            offset = self._unread_log_offset(signature[1])
+        if offset is None:
+            self._load_snapshot()
+            self._replay_log(signature[0], 0)
+            # the entries not written yet are applied again on the loaded data
+            for line, _ in list(self._pending):
+                self._apply_log_entry(self._decode_log_line(line))
+        else:
+            self._replay_log(signature[0], offset)
+        self._cache_signature = signature
+
+    def _unread_log_offset(self, log_signature):
+        """Returns the offset of the log entries not applied yet to the data list,
+        None if the snapshot has to be loaded again"""
+        cached_log_signature = self._cache_signature[1]
+        if self._log_offset is None:
+            # no entry of the log has been applied, so it is read from the beginning
+            return 0
+        if log_signature is not None and cached_log_signature is not None and \
+                log_signature[0] == cached_log_signature[0] and \
+                log_signature[1] >= cached_log_signature[1]:
+            return self._log_offset
+        # the log has been replaced, so the snapshot has to be loaded again
+        return None
+
+    def _load_snapshot(self):
+        """Loads the snapshot into the data list"""
         try:
             with open(self._FILE_PATH, "r", encoding="utf-8", newline="") as file:
-                self._data_list = json.load(file)
+                data_list = json.load(file)
         except FileNotFoundError:
             # file is not found , so  init my data_list
-            self._data_list = []
+            data_list = []
+        except json.JSONDecodeError as exception_raised:
+            raise VaccineManagementException("JSON Decode Error - Wrong JSON Format") \
+                from exception_raised
+        self._set_records([self._compact_record(item) for item in data_list])
+
+    def _compact_record(self, record):
+        """Returns the record as a Record of the schema of the store, if it has one"""
+        if self._RECORD_SCHEMA is None:
+            return record
+        return self._RECORD_SCHEMA.record(record)
+
+    def _set_records(self, data_list):
+        """Replaces the records of the store and builds their indexes
+
+        The positions keep growing from the ones of the previous records, so a
+        concurrent lookup never takes a new record for an old one."""
+        first_position = self._next_position
+        records = dict(enumerate(data_list, first_position))
+        indexes = {field: {} for field in [self._ID_FIELD] + self._INDEX_FIELDS}
+        digest = 0
+        for position, item in records.items():
+            for field, index in indexes.items():
+                index.setdefault(item.get(field), []).append(position)
+            digest = (digest + self.record_digest(item)) % self._DIGEST_MODULUS
+        for index in indexes.values():
+            for value, positions in index.items():
+                index[value] = tuple(positions)
+        self._next_position = first_position + len(data_list)
+        self._snapshot_records = len(data_list)
+        self._log_additions = 0
+        self._log_tombstones = 0
+        self._digest = digest
+        self._records, self._indexes = records, indexes
+
+    def _index_item(self, position, item):
+        """Adds the position of the item to the indexes"""
+        for field, index in self._indexes.items():
+            index[item.get(field)] = index.get(item.get(field), ()) + (position,)
+
+    def _unindex_item(self, position, item):
+        """Removes the position of the item from the indexes"""
+        for field, index in self._indexes.items():
+            positions = tuple(indexed for indexed in index[item.get(field)]
+                              if indexed != position)
+            if positions:
+                index[item.get(field)] = positions
+            else:
+                del index[item.get(field)]
+
+    def _replay_log(self, snapshot_signature, offset):
+        """Applies the entries of the log from the offset on to the data list
+
+        Only complete lines are applied: a line without its end of line is a
+        write in progress, or one interrupted by a crash."""
+        try:
+            with open(self._log_path, "rb") as file:
+                file.seek(offset)
+                data = file.read()
+        except FileNotFoundError:
+            self._log_offset = None
+            return
+        data = data[:data.rfind(b"\n") + 1]
+        lines = data.decode("utf-8").splitlines()
+        if offset == 0:
+            # a log written for another snapshot (the file has been replaced) is stale
+            if not lines or self._decode_log_line(lines[0]) != \
+                    self._log_header(snapshot_signature):
+                self._log_offset = None
+                return
+            lines = lines[1:]
+        for line in lines:
+            entry = self._decode_log_line(line)
+            self._count_log_entry("add" if "add" in entry else "erase")
+            self._apply_log_entry(entry)
+        self._log_offset = offset + len(data)
+
+    def _count_log_entry(self, operation):
+        """Counts an entry written in the log"""
+        if operation == "add":
+            self._log_additions += 1
+        else:
+            self._log_tombstones += 1
+
+    @staticmethod
+    def _decode_log_line(line):
+        """Decodes a line of the log"""
+        try:
+            return json.loads(line)
         except json.JSONDecodeError as exception_raised:
             raise VaccineManagementException("JSON Decode Error - Wrong JSON Format") \
                 from exception_raised
 
+    def _apply_log_entry(self, entry):
+        """Applies an add or erase entry of the log to the data list"""
+        if "add" in entry:
+            self._insert_item(self._compact_record(entry["add"]))
+        else:
+            key, key_value = entry["erase"]
+            self._remove_item(key_value, key)
+
+    def _queue_log_entry(self, entry):
+        """Adds an entry to the ones pending to be written to the log, returns its number"""
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with self._pending_lock:
+            self._pending.append((line, "add" if "add" in entry else "erase"))
+            self._appended_count += 1
+            return self._appended_count
+
+    def _commit_log_entry(self, ticket, durable=True, buffered=False):
+        """Writes the log entries up to the ticket by group commit
+
+        A durable entry follows the durability of the store, or the buffered
+        one if requested, otherwise it is written at once without waiting for
+        the disk (the transactions use the journal to make their entries
+        durable)."""
+        if not durable:
+            self._flush_log(False)
+        elif buffered or self._DURABILITY == "buffered":
+            self._schedule_flush()
+        else:
+            self._flush_log(True, ticket)
+
+    def _schedule_flush(self):
+        """Starts the timer that flushes the buffered entries when the window ends"""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                return
+            self._flush_timer = threading.Timer(self._COMMIT_WINDOW, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+            atexit.register(self.flush)
+
+    def flush(self):
+        """Barrier: returns once every entry appended to the log is synced to disk"""
+        self._flush_log(True)
+
+    def close(self):
+        """Syncs the entries appended to the log and closes the lock file of the
+        store, which is opened again if the store is used"""
+        self.flush()
+        self._store_lock.close()
+
+    def _flush_log(self, sync, ticket=None):
+        """Writes the pending entries to the log, syncing them to disk if requested
+
+        Only one thread syncs the log at a time. The entries appended by other
+        threads meanwhile are written and synced together by the next one, so
+        many of those threads find their entries already synced (group commit)."""
+        with self._sync_lock:
+            if ticket is not None and self._synced_count >= ticket:
+                return
+            with self._locked():
+                with self._pending_lock:
+                    if self._flush_timer is not None:
+                        self._flush_timer.cancel()
+                        self._flush_timer = None
+                        atexit.unregister(self.flush)
+                appended_count = self._write_pending()
+            if sync and self._synced_count < appended_count:
+                self._sync_log()
+                self._synced_count = appended_count
+        if self._compaction_needed():
+            if self._BACKGROUND_COMPACTION:
+                self.compact_in_background()
+            else:
+                self.compact()
+
+    def _write_pending(self):
+        """Writes the pending entries at the end of the log, holding the lock of the
+        store; returns the number of the last entry written"""
+        # the log is appended to the files as they are now
+        self._load_changes(True)
+        with self._pending_lock:
+            lines, self._pending = self._pending, []
+            appended_count = self._appended_count
+        if lines:
+            self._write_log(b"".join(line for line, _ in lines))
+            for _, operation in lines:
+                self._count_log_entry(operation)
+        return appended_count
+
+    def _compaction_needed(self):
+        """Checks if the log is too big or too many records in the files are erased"""
+        with self._write_lock:
+            if self._log_offset is None:
+                return False
+            snapshot_size = self._cache_signature[0][1] if self._cache_signature[0] else 0
+            dead_records = self._log_tombstones
+            return self._log_offset > max(snapshot_size, self._COMPACTION_MIN_BYTES) or \
+                (dead_records >= self._COMPACTION_MIN_DEAD and dead_records >
+                 self._COMPACTION_DEAD_RATIO * (len(self._records) + dead_records))
+
+    def store_metrics(self):
+        """Returns the number of live and erased records of the store files"""
+        with self._write_lock:
+            self.load()
+            return {"live_records": len(self._records),
+                    "dead_records": self._log_tombstones,
+                    "snapshot_records": self._snapshot_records,
+                    "log_additions": self._log_additions,
+                    "log_tombstones": self._log_tombstones,
+                    "log_bytes": self._log_offset or 0}
+
+    def _write_log(self, data):
+        """Writes the data at the end of the log, starting a new log if needed"""
+        snapshot_signature = self._cache_signature[0]
+        try:
+            if self._log_offset is None:
+                # there is no log for the current snapshot
+                data = (json.dumps(self._log_header(snapshot_signature)) + "\n").encode("utf-8") \
+                       + data
+                mode = "wb"
+                self._log_offset = 0
+            else:
+                # drops an incomplete line left by a crash before appending
+                if os.path.getsize(self._log_path) > self._log_offset:
+                    os.truncate(self._log_path, self._log_offset)
+                mode = "ab"
+            with open(self._log_path, mode) as file:
+                file.write(data)
+        except FileNotFoundError as ex:
+            raise VaccineManagementException("Wrong file or file path") from ex
+        self._log_offset += len(data)
+        self._cache_signature = (snapshot_signature, self._file_signature(self._log_path))
+        self._count_change()
+
+    def _sync_log(self):
+        """Syncs the log to disk"""
+        try:
+            with open(self._log_path, "rb") as file:
+                os.fsync(file.fileno())
+        except FileNotFoundError:
+            # the log has been compacted into a snapshot, which is already synced
+            pass
+
+    def compact(self):
+        """Folds the log into a new snapshot of the store"""
+        with self._locked():
+            self._load_changes(True)
+            self.save()
+
+    def compact_in_background(self):
+        """Compacts the store in a background thread, unless one is already running"""
+        with self._pending_lock:
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return self._compaction_thread
+            self._compaction_thread = threading.Thread(target=self._compact_concurrently,
+                                                       daemon=True)
+            self._compaction_thread.start()
+            return self._compaction_thread
+
+    def _compact_concurrently(self):
+        """Writes a new snapshot letting the store be used meanwhile
+
+        The snapshot is only installed if the store has not changed while it
+        was written; otherwise it is discarded and the next write that finds
+        the store needs compaction starts another one."""
+        try:
+            self._flush_log(False)
+            with self._locked(exclusive=False):
+                self._load_changes(True)
+                signature = self._cache_signature
+                appended_count = self._appended_count
+                data_list = self._data_list
+            # other processes may be compacting the store too
+            temporary_path = self._write_snapshot_file(
+                data_list, ".compaction." + str(os.getpid()) + "." + str(threading.get_ident()))
+            with self._locked():
+                self._load_changes(True)
+                if self._cache_signature == signature and \
+                        self._appended_count == appended_count:
+                    self._install_snapshot(temporary_path, appended_count)
+                    return
+            os.remove(temporary_path)
+        except (OSError, VaccineManagementException):
+            # the compaction is an optimization, the store is valid without it
+            pass
+
     def save(self):
-        """Saves the data list in the JSON file"""
+        """Saves the data list in the JSON file as a new snapshot
+
+        The snapshot is written to a temporary file, synced and renamed over
+        the JSON file, so the file is never left half written."""
+        with self._locked():
+            with self._pending_lock:
+                # the entries not written yet are already in the data list
+                self._pending = []
+                appended_count = self._appended_count
+            temporary_path = self._write_snapshot_file(self._data_list, ".tmp")
+            self._install_snapshot(temporary_path, appended_count)
+
+    def _write_snapshot_file(self, data_list, suffix):
+        """Writes and syncs the data list to a temporary file, one item per line,
+        returns its path"""
+        temporary_path = self._FILE_PATH + suffix
         try:
-            with open(self._FILE_PATH, "w", encoding="utf-8", newline="") as file:
-                json.dump(self._data_list, file, indent=2)
+            with open(temporary_path, "w", encoding="utf-8", newline="") as file:
+                file.write("[\n" + ",\n".join(map(json.dumps, data_list)) +
+                           ("\n]" if data_list else "]"))
+                file.flush()
+                os.fsync(file.fileno())
         except FileNotFoundError as ex:
             raise VaccineManagementException("Wrong file or file path") from ex
+        return temporary_path
 
-    def add_item(self, item):
-        """Adds a new item to the data list and updates the JSON file"""
+    def _install_snapshot(self, temporary_path, appended_count):
+        """Renames the temporary file as the snapshot and removes the log"""
+        os.replace(temporary_path, self._FILE_PATH)
+        self._sync_folder()
+        # the snapshot contains every change, so the log is not needed anymore
+        if os.path.isfile(self._log_path):
+            os.remove(self._log_path)
+        self._synced_count = appended_count
+        self._cache_signature = (self._file_signature(self._FILE_PATH), None)
+        self._log_offset = None
+        self._snapshot_records = len(self._records)
+        self._log_additions = 0
+        self._log_tombstones = 0
+        self._count_change()
+
+    def _sync_folder(self):
+        """Syncs the folder of the store so the rename of the snapshot is durable"""
+        try:
+            folder = os.open(os.path.dirname(self._FILE_PATH) or ".", os.O_RDONLY)
+        except OSError:
+            # folders cannot be opened in every platform
+            return
+        try:
+            os.fsync(folder)
+        finally:
+            os.close(folder)
+
+    def _validate_item(self, item):
+        """Checks the item can be added to the store, overridden by the stores"""
+
+    def add_item(self, item, buffered=False):
+        """Adds a new item to the data list and appends it to the log
+
+        The item is validated against the files as they are and written to
+        the log holding the lock of the store, so two threads or processes
+        cannot add the same item; the log is then synced by group commit. A
+        buffered item is written with the "buffered" durability whatever the
+        durability of the store: it is kept in memory until it is flushed, so
+        the other processes do not see it before."""
+        buffered = buffered or self._DURABILITY == "buffered"
         self.load()
-        self._data_list.append(item.__dict__)
-        self.save()
+        with self._locked():
+            self._load_changes(True)
+            self._validate_item(item)
+            ticket = self._stage_record(item.__dict__)
+            if not buffered:
+                self._write_pending()
+        self._commit_log_entry(ticket, buffered=buffered)
+
+    def add_items(self, items):
+        """Adds a batch of items loading and persisting the store once
+
+        Every item is validated against the items already added, including
+        the previous ones of the batch. Returns an ItemResult per item, with
+        the exception raised by the ones that could not be added."""
+        results = []
+        ticket = None
+        self.load()
+        with self._locked():
+            self._load_changes(True)
+            for item in self._valid_items(items, results):
+                record = self._compact_record(item.__dict__)
+                self._insert_item(record)
+                ticket = self._queue_log_entry({"add": record})
+            if self._DURABILITY != "buffered":
+                self._write_pending()
+        if ticket is not None:
+            self._commit_log_entry(ticket)
+        return results
+
+    def _valid_items(self, items, results):
+        """Yields the valid items, each one validated once the previous ones are added,
+        appending the ItemResult of every item to results"""
+        for item in items:
+            try:
+                self._validate_item(item)
+            except VaccineManagementException as exception_raised:
+                results.append(ItemResult(item, exception_raised))
+                continue
+            results.append(ItemResult(item, None))
+            yield item
+
+    def _add_record(self, record, durable=True):
+        """Adds the record to the data list and appends it to the log"""
+        self._commit_log_entry(self._stage_record(record), durable)
+
+    def _stage_record(self, record):
+        """Adds the record to the data list and queues its log entry, returns its ticket"""
+        record = self._compact_record(record)
+        with self._write_lock:
+            self.load()
+            self._insert_item(record)
+            return self._queue_log_entry({"add": record})
+
+    def _insert_item(self, item):
+        """Appends the item to the records and the indexes"""
+        position = self._next_position
+        self._next_position += 1
+        self._records[position] = item
+        self._index_item(position, item)
+        self._digest = (self._digest + self.record_digest(item)) % self._DIGEST_MODULUS
+
+    def _matching_positions(self, key_value, key):
+        """Returns the positions of the items with the key_value, using the index of the key"""
+        if key in self._indexes:
+            return self._indexes[key].get(key_value, ())
+        return [position for position, item in self._records.copy().items()
+                if item[key] == key_value]
+
+    def _matching_items(self, key_value, key):
+        """Returns the items with the key_value, looking them up again holding the lock
+        if a concurrent change erased one of them"""
+        records = self._records
+        positions = self._matching_positions(key_value, key)
+        items = [records[position] for position in positions if position in records]
+        if len(items) == len(positions):
+            return items
+        with self._write_lock:
+            return [self._records[position]
+                    for position in self._matching_positions(key_value, key)]
 
     def find_item(self, key_value, key=None):
         """Finds the first item with the key_value in the data list"""
         self.load()
         if key is None:
             key = self._ID_FIELD
-        for item in self._data_list:
-            if item[key] == key_value:
-                return item
-        return None
+        items = self._matching_items(key_value, key)
+        return items[0] if items else None
+
+    def _remove_item(self, key_value, key):
+        """Removes the first item with the key_value from the records"""
+        positions = self._matching_positions(key_value, key)
+        if not positions:
+            return False
+        position = positions[0]
+        item = self._records.pop(position)
+        self._unindex_item(position, item)
+        self._digest = (self._digest - self.record_digest(item)) % self._DIGEST_MODULUS
+        return True
 
     def erase_item(self, key_value, key=None):
-        self.load()
-        self._data_list.remove(self.find_item(key_value, key))
-        self.save()
+        """Erases the first item with the key_value, appending a tombstone to the log"""
+        self._erase_record(key_value, self._ID_FIELD if key is None else key)
+
+    def _erase_record(self, key_value, key, durable=True):
+        """Removes the first record with the key_value and appends a tombstone to the log"""
+        with self._write_lock:
+            self.load()
+            if not self._remove_item(key_value, key):
+                return
+            ticket = self._queue_log_entry({"erase": [key, key_value]})
+        self._commit_log_entry(ticket, durable)
 
     def find_items_list(self, key_value, key=None):
         """Finds all the items with the key_value in the data list"""
         self.load()
         if key is None:
             key = self._ID_FIELD
-        data_list_result = []
-        for item in self._data_list:
-            if item[key] == key_value:
-                data_list_result.append(item)
-        return data_list_result
+        return self._matching_items(key_value, key)
+
+    def iter_items(self, predicate=None):
+        """Yields the items of the store, or the ones the predicate is true for,
+        reading the files as a stream instead of loading them
+
+        The snapshot is decoded item by item and the log is read twice: first
+        its tombstones, the only entries kept in memory, and then its items.
+        A tombstone hides the first item it matches that was added before it,
+        as when the log is replayed. The items are the ones in the files when
+        the iteration starts, later changes are not seen."""
+        self._flush_log(False)
+        # the files are opened holding the lock, so a compaction cannot replace
+        # the snapshot between them
+        with self._locked(exclusive=False):
+            snapshot_file, log_file, log_size = self._open_files()
+        try:
+            tombstones = {}
+            for number, entry in self._stream_log(log_file, log_size, snapshot_file):
+                if "erase" in entry:
+                    key, key_value = entry["erase"]
+                    tombstones.setdefault(key, {}).setdefault(
+                        json.dumps(key_value), []).append(number)
+            for item in map(self._compact_record, self._stream_snapshot(snapshot_file)):
+                if not self._consume_tombstone(tombstones, item, -1) and \
+                        (predicate is None or predicate(item)):
+                    yield item
+            for number, entry in self._stream_log(log_file, log_size, snapshot_file):
+                if "add" not in entry:
+                    continue
+                item = self._compact_record(entry["add"])
+                if not self._consume_tombstone(tombstones, item, number) and \
+                        (predicate is None or predicate(item)):
+                    yield item
+        finally:
+            for file in (snapshot_file, log_file):
+                if file is not None:
+                    file.close()
+
+    def iter_chunks(self, size, predicate=None):
+        """Yields the items of the store in lists of up to size items"""
+        chunk = []
+        for item in self.iter_items(predicate):
+            chunk.append(item)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    # pylint: disable=consider-using-with
+    def _open_files(self):
+        """Opens the snapshot and the log, returns them and the size of the log"""
+        try:
+            snapshot_file = open(self._FILE_PATH, "r", encoding="utf-8", newline="")
+        except FileNotFoundError:
+            snapshot_file = None
+        try:
+            log_file = open(self._log_path, "rb")
+        except FileNotFoundError:
+            return snapshot_file, None, 0
+        return snapshot_file, log_file, os.fstat(log_file.fileno()).st_size
+
+    def _stream_log(self, log_file, log_size, snapshot_file):
+        """Yields the number and entry of the complete lines of the log, if it is not stale"""
+        if log_file is None:
+            return
+        log_file.seek(0)
+        snapshot_signature = None
+        if snapshot_file is not None:
+            stat = os.fstat(snapshot_file.fileno())
+            snapshot_signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        read_bytes = 0
+        for number, line in enumerate(log_file):
+            read_bytes += len(line)
+            if read_bytes > log_size or not line.endswith(b"\n"):
+                return
+            entry = self._decode_log_line(line)
+            if number == 0:
+                if entry != self._log_header(snapshot_signature):
+                    return
+            else:
+                yield number, entry
+
+    @staticmethod
+    def _stream_snapshot(snapshot_file, chunk_size=64 * 1024):
+        """Yields the items of the JSON array of the snapshot decoding them one by one"""
+        if snapshot_file is None:
+            return
+        decoder = json.JSONDecoder()
+        buffer = ""
+        position = 0
+        started = False
+        end_of_file = False
+        while True:
+            while position < len(buffer) and \
+                    (buffer[position].isspace() or (started and buffer[position] == ",")):
+                position += 1
+            if position < len(buffer) and not started:
+                if buffer[position] != "[":
+                    break
+                started = True
+                position += 1
+                continue
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                # a value at the end of the buffer may continue in the next chunk
+                complete = end < len(buffer) or end_of_file
+            except json.JSONDecodeError:
+                complete = False
+            if not complete:
+                if end_of_file:
+                    break
+                chunk = snapshot_file.read(chunk_size)
+                end_of_file = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            position = end
+            yield item
+        raise VaccineManagementException("JSON Decode Error - Wrong JSON Format")
+
+    @staticmethod
+    def _consume_tombstone(tombstones, item, number):
+        """Removes the first tombstone written after the entry number that matches the item,
+        returns if there was one"""
+        first_key = first_position = None
+        for key, values in tombstones.items():
+            numbers = values.get(json.dumps(item.get(key)), [])
+            position = bisect.bisect_right(numbers, number)
+            if position < len(numbers) and \
+                    (first_key is None or numbers[position] <
+                     tombstones[first_key][json.dumps(item.get(first_key))][first_position]):
+                first_key, first_position = key, position
+        if first_key is None:
+            return False
+        del tombstones[first_key][json.dumps(item.get(first_key))][first_position]
+        return True
 
     def delete_json_file(self):
-        """delete the json file"""
-        if os.path.isfile(self._FILE_PATH):
-            os.remove(self._FILE_PATH)
+        """delete the json file and its log, and the items kept in memory"""
+        self._discard_journal_operations()
+        with self._locked():
+            with self._pending_lock:
+                self._pending = []
+                self._synced_count = self._appended_count
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                    atexit.unregister(self.flush)
+            for path in (self._FILE_PATH, self._log_path):
+                if os.path.isfile(path):
+                    os.remove(path)
+            self._store_lock.increase_generation()
+            # the store is read again from the files when it is used
+            self._set_records([])
+            self._cache_signature = None
+            self._log_offset = None
+            self._generation = None
+        self._store_lock.close()
 
     def empty_json_file(self):
         """removes all data from the json file"""
-        self._data_list = []
-        self.save()
+        self._discard_journal_operations()
+        with self._locked():
+            self._load_changes(True)
+            self._set_records([])
+            self.save()
+
+    @staticmethod
+    def record_digest(item):
+        """Returns the md5 of a record as a number"""
+        return int(hashlib.md5(json.dumps(item, sort_keys=True).encode()).hexdigest(), 16)
 
     def data_hash(self):
-        """calculates the md5 hash of the file's content"""
-        return hashlib.md5(self._data_list.__str__().encode()).hexdigest()
+        """Returns the digest of the store's content
+
+        The digest is the sum of the md5 of every record, so it does not depend
+        on their order and it is updated as they are added and erased."""
+        self.load()
+        return format(self._digest, "032x")
+
+    def data_version(self):
+        """Returns a value that changes whenever the content of the store changes
+
+        It is the digest kept in memory, so it costs no more than a load."""
+        self.load()
+        return self._digest
+
+    @contextmanager
+    def _journal_locked(self):
+        """Locks the journal for the threads of this process and for the other processes"""
+        with JsonStore._recovery_lock:
+            if self._journal_path not in JsonStore._journal_locks:
+                JsonStore._journal_locks[self._journal_path] = \
+                    (threading.RLock(), StoreLock(self._journal_path + self._LOCK_SUFFIX))
+            thread_lock, journal_lock = JsonStore._journal_locks[self._journal_path]
+        with thread_lock:
+            journal_lock.acquire(True)
+            try:
+                yield
+            finally:
+                journal_lock.release()
+
+    # pylint: disable=protected-access
+    def commit_transaction(self, operations):
+        """Commits at once the operations of a transaction on the stores of the folder
+
+        The operations are (store, "add", record) or (store, "erase", (key_value,
+        key)) tuples. Holding the lock of the journal, the transactions left in
+        it by a process that stopped are applied first; then the operations are
+        appended to the journal and synced to disk, which is the commit point,
+        and applied to the stores. The journal is emptied once the logs of the
+        stores of all its transactions are synced."""
+        operations = [(store._operation_store(operation, payload), operation, payload)
+                      for store, operation, payload in operations]
+        entry = [{"store": store._FILE_PATH, "id_field": store._ID_FIELD, operation: payload}
+                 for store, operation, payload in operations]
+        with JsonStore._recovery_lock:
+            # the journal is recovered below, not by the stores loaded by the commit
+            JsonStore._recovered_journals.add(self._journal_path)
+        with self._journal_locked():
+            replayed_stores = self._replay_journal()
+            try:
+                with open(self._journal_path, "a", encoding="utf-8", newline="") as file:
+                    file.write(json.dumps(entry) + "\n")
+                    file.flush()
+                    os.fsync(file.fileno())
+            except FileNotFoundError as ex:
+                raise VaccineManagementException("Wrong file or file path") from ex
+            for store, operation, payload in operations:
+                if operation == "add":
+                    store._add_record(payload, False)
+                else:
+                    store._erase_record(*payload, False)
+            self._checkpoint_stores(replayed_stores.values(),
+                                    [store for store, _, _ in operations])
+
+    def _operation_store(self, operation, payload):
+        """Returns the store whose files are changed by an operation of a transaction"""
+        # pylint: disable=unused-argument
+        return self
+
+    def recover_transactions(self):
+        """Applies the transactions left in the journal by a process that stopped
+
+        It is done the first time a store of the folder is loaded by the
+        process, and by every commit before its own transaction."""
+        with JsonStore._recovery_lock:
+            if self._journal_path in JsonStore._recovered_journals:
+                return
+            JsonStore._recovered_journals.add(self._journal_path)
+        if not os.path.isfile(self._journal_path):
+            return
+        with self._journal_locked():
+            self._checkpoint_stores(self._replay_journal().values())
+
+    def _replay_journal(self):
+        """Applies again the transactions in the journal, holding its lock; returns
+        the stores they changed by path, one store per path"""
+        stores = {}
+        for entry in self._read_journal():
+            for operation in entry:
+                path = operation["store"]
+                if path not in stores:
+                    stores[path] = JsonStore(path, operation["id_field"],
+                                             record_schema=RecordSchema.for_field(
+                                                 operation["id_field"]))
+                store = stores[path]
+                # the operations are applied only if they are not in the store yet
+                if "add" in operation:
+                    record = operation["add"]
+                    if store.find_item(record[store._ID_FIELD]) is None:
+                        store._add_record(record, False)
+                else:
+                    store._erase_record(*operation["erase"], False)
+        return stores
+
+    def checkpoint_transactions(self):
+        """Applies the transactions in the journal, syncs their stores and empties it"""
+        with self._journal_locked():
+            self._checkpoint_stores(self._replay_journal().values())
+
+    def _checkpoint_stores(self, replayed_stores, stores=()):
+        """Syncs the logs of the stores, which hold every transaction of the journal,
+        and empties it; the stores created to replay the journal are closed"""
+        for store in stores:
+            store.flush()
+        for store in replayed_stores:
+            store.close()
+        if os.path.isfile(self._journal_path):
+            os.remove(self._journal_path)
+
+    def _discard_journal_operations(self):
+        """Removes the operations on the store from the journal, as it is emptied"""
+        if not os.path.isfile(self._journal_path):
+            return
+        with self._journal_locked():
+            entries = [[operation for operation in entry
+                        if operation["store"] != self._FILE_PATH]
+                       for entry in self._read_journal()]
+            entries = [entry for entry in entries if entry]
+            if entries:
+                with open(self._journal_path, "w", encoding="utf-8", newline="") as file:
+                    file.writelines(json.dumps(entry) + "\n" for entry in entries)
+                    file.flush()
+                    os.fsync(file.fileno())
+            elif os.path.isfile(self._journal_path):
+                os.remove(self._journal_path)
+
+    def _read_journal(self):
+        """Returns the transactions of the journal, without a last incomplete one"""
+        try:
+            with open(self._journal_path, "r", encoding="utf-8", newline="") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return []
+        return [self._decode_log_line(line) for line in lines if line.endswith("\n")]
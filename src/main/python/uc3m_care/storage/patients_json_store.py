@@ -1,25 +1,29 @@
 """Subclass of JsonStore for managing the Patients store"""
-from uc3m_care.storage.json_store import JsonStore
+from uc3m_care.storage.store_engine import store_engine
+from uc3m_care.storage.singleton_store import SingletonStore
+from uc3m_care.storage.record_schema import PATIENT_SCHEMA
 from uc3m_care.cfg.vaccine_manager_config import JSON_FILES_PATH
 from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
 
-class PatientsJsonStore:
+class PatientsJsonStore(SingletonStore):
     """Implements the singleton pattern"""
 
-    #pylint: disable=invalid-name
-    class __PatientsJsonStore(JsonStore):
+    # pylint: disable=invalid-name, too-few-public-methods
+    class __PatientsJsonStore(store_engine()):
         """Subclass of JsonStore for managing the VaccinationLog"""
         _FILE_PATH = JSON_FILES_PATH + "store_patient.json"
         _ID_FIELD = "_VaccinePatientRegister__patient_sys_id"
+        _RECORD_SCHEMA = PATIENT_SCHEMA
+        _INDEX_FIELDS = ["_VaccinePatientRegister__patient_id"]
+        _VALIDATES_AGAINST_ITEMS = True
 
-        def add_item( self, item ):
-            """Overrides the add_item method to verify the item to be stored"""
+        def _validate_item( self, item ):
+            """Overrides the _validate_item method to verify the item to be stored"""
             #pylint: disable=import-outside-toplevel, cyclic-import
             from uc3m_care.data.vaccine_patient_register import VaccinePatientRegister
             if not isinstance(item, VaccinePatientRegister):
                 raise VaccineManagementException("Invalid patient object")
 
-            patient_found = False
             patient_records = self.find_items_list\
                 (item.patient_id,"_VaccinePatientRegister__patient_id")
             for patient_recorded in patient_records:
@@ -30,18 +34,4 @@ class PatientsJsonStore:
                          == item.full_name):
                     raise VaccineManagementException("patien_id is registered in store_patient")
 
-            if not patient_found:
-                super().add_item(item)
-
-    instance = None
-
-    def __new__(cls):
-        if not PatientsJsonStore.instance:
-            PatientsJsonStore.instance = PatientsJsonStore.__PatientsJsonStore()
-        return PatientsJsonStore.instance
-
-    def __getattr__(self, name):
-        return getattr(self.instance, name)
-
-    def __setattr__(self, name, value):
-        return setattr(self.instance, name, value)
+    _STORE_CLASS = __PatientsJsonStore
@@ -0,0 +1,88 @@
+"""Compact representation of the records of the stores"""
+from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
+
+
+class Record(tuple):
+    """Record kept as the tuple of the values of the fields of its schema
+
+    It is read like the dictionary of the attributes of the item it was
+    made from: record["_VaccinationLog__date_signature"], record.get(key),
+    dict(record). Written as JSON it is the list of its values."""
+    __slots__ = ()
+    _keys = ()
+    _positions = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._positions[key])
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def get(self, key, default=None):
+        """Returns the value of the field, or default if the schema has not that field"""
+        position = self._positions.get(key)
+        return default if position is None else tuple.__getitem__(self, position)
+
+    def keys(self):
+        """Returns the fields of the record"""
+        return self._keys
+
+    def items(self):
+        """Returns the fields and values of the record"""
+        return zip(self._keys, tuple(self))
+
+    def __repr__(self):
+        return type(self).__name__ + repr(dict(self.items()))
+
+
+class RecordSchema:
+    """Fields of the records of the items of a class
+
+    The stores with a schema keep their records as Records and write them to
+    their files as JSON lists of values in the order of the fields, instead
+    of objects with the name-mangled attribute names as keys. The records
+    written as objects by previous versions are read as well. The fields
+    must keep their order: new ones can only be added at the end, and they
+    are None in the records written before they were added."""
+    _schemas = []
+
+    def __init__(self, class_name, attributes):
+        self.keys = tuple("_" + class_name + "__" + attribute for attribute in attributes)
+        self.record_class = type(class_name + "Record", (Record,),
+                                 {"__slots__": (), "_keys": self.keys,
+                                  "_positions": {key: position for position, key
+                                                 in enumerate(self.keys)}})
+        RecordSchema._schemas.append(self)
+
+    @classmethod
+    def for_field(cls, field):
+        """Returns the schema with the field, or None"""
+        return next((schema for schema in cls._schemas if field in schema.keys), None)
+
+    def record(self, stored):
+        """Returns the Record of a stored list of values or dictionary of attributes,
+        which can lack the last fields; a dictionary with other attributes is
+        returned as it is"""
+        if isinstance(stored, self.record_class):
+            return stored
+        if isinstance(stored, list):
+            if len(stored) > len(self.keys):
+                raise VaccineManagementException("JSON Decode Error - Wrong JSON Format")
+            return self.record_class(stored + [None] * (len(self.keys) - len(stored)))
+        if len(stored) > len(self.keys) or \
+                any(key not in stored for key in self.keys[:len(stored)]):
+            return stored
+        return self.record_class(stored.get(key) for key in self.keys)
+
+
+PATIENT_SCHEMA = RecordSchema("VaccinePatientRegister",
+                              ["patient_id", "full_name", "registration_type", "phone_number",
+                               "age", "time_stamp", "patient_sys_id"])
+APPOINTMENT_SCHEMA = RecordSchema("VaccinationAppointment",
+                                  ["alg", "type", "patient_sys_id", "patient_id", "phone_number",
+                                   "issued_at", "appointment_date", "date_signature"])
+VACCINATION_SCHEMA = RecordSchema("VaccinationLog", ["date_signature", "timestamp"])
+CANCELLATION_SCHEMA = RecordSchema("VaccinationCancellation",
+                                   ["date_signature", "cancellation_type", "reason"])
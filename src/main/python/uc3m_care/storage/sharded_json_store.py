@@ -0,0 +1,251 @@
+"""Superclass for managing storage in JSON files split in shards"""
+import hashlib
+import os
+from contextlib import contextmanager
+
+from uc3m_care.cfg.vaccine_manager_config import STORE_SHARDS
+from uc3m_care.storage.json_store import JsonStore
+
+
+# pylint: disable=protected-access
+class ShardedJsonStore(JsonStore):
+    """Implements the JsonStore methods with the items split in _SHARDS stores
+
+    The shard of an item is chosen by the prefix of its _ID_FIELD value (the
+    signatures and system ids are hexadecimal hashes, so they are uniformly
+    distributed). Adding, finding or erasing by id only touches one shard,
+    whose files are independent of the others. Searches by other keys go
+    through every shard, in shard order. Each shard is written holding only
+    its own lock; the stores whose validation looks up their items also
+    hold the lock of the sharded store while validating and adding an item.
+    An unsharded store found in _FILE_PATH is split into the shards the
+    first time it is loaded, holding the lock of the sharded store.
+    """
+    _SHARDS = STORE_SHARDS
+    # the lock file of the sharded store is not the one of the unsharded store
+    _LOCK_SUFFIX = ".shards.lock"
+    _shards = None
+
+    def _shard_path(self, number):
+        """Path of the JSON file of a shard"""
+        root, extension = os.path.splitext(self._FILE_PATH)
+        return root + ".shard" + format(number, "02d") + extension
+
+    @property
+    def shards(self):
+        """Returns the stores of the shards"""
+        if self._shards is None:
+            with self._write_lock:
+                if self._shards is None:
+                    shards = [JsonStore(self._shard_path(number), self._ID_FIELD,
+                                        self._INDEX_FIELDS, self._RECORD_SCHEMA)
+                              for number in range(self._SHARDS)]
+                    for shard in shards:
+                        shard._DURABILITY = self._DURABILITY
+                    self._migrate_unsharded_store(shards)
+                    self._shards = shards
+        return self._shards
+
+    def _migrate_unsharded_store(self, shards):
+        """Moves the items of the unsharded store to the shards
+
+        It is done holding the lock of the sharded store, so only one process
+        migrates it. The items already in their shard are not added again, so
+        a migration stopped before removing the unsharded store is resumed."""
+        with self._locked():
+            if not os.path.isfile(self._FILE_PATH) and not os.path.isfile(self._log_path):
+                return
+            unsharded_store = JsonStore(self._FILE_PATH, self._ID_FIELD,
+                                        record_schema=self._RECORD_SCHEMA)
+            for record in unsharded_store._data_list:
+                key_value = record.get(self._ID_FIELD)
+                shard = self._shard_of(shards, key_value)
+                if record not in shard.find_items_list(key_value):
+                    shard._add_record(record, False)
+            for shard in shards:
+                shard.flush()
+            unsharded_store.delete_json_file()
+
+    @contextmanager
+    def _validation_locked(self):
+        """Holds the lock of the sharded store if the validation of the items looks up
+        the items, which can be in any shard"""
+        if self._VALIDATES_AGAINST_ITEMS:
+            with self._locked():
+                yield
+        else:
+            yield
+
+    def _shard(self, key_value):
+        """Returns the shard of the items with the key_value in the id field"""
+        return self._shard_of(self.shards, key_value)
+
+    @staticmethod
+    def _shard_of(shards, key_value):
+        """Returns the shard, of the shards received, of the items with the key_value"""
+        key = str(key_value)
+        try:
+            prefix = int(key[:4], 16)
+        except ValueError:
+            prefix = int(hashlib.md5(key.encode()).hexdigest()[:4], 16)
+        return shards[prefix % len(shards)]
+
+    def _key_shards(self, key_value, key):
+        """Returns the shards where the items with the key_value can be"""
+        if key is None or key == self._ID_FIELD:
+            return [self._shard(key_value)]
+        return self.shards
+
+    def load(self):
+        """Loads every shard"""
+        for shard in self.shards:
+            shard.load()
+
+    @property
+    def _data_list(self):
+        """Returns the items of all the shards"""
+        return [item for shard in self.shards for item in shard._data_list]
+
+    def flush(self):
+        """Flushes the log of every shard"""
+        for shard in self.shards:
+            shard.flush()
+
+    def close(self):
+        """Closes every shard and the lock file of the sharded store"""
+        for shard in self.shards:
+            shard.close()
+        self._store_lock.close()
+
+    def compact(self):
+        """Compacts the log of every shard"""
+        for shard in self.shards:
+            shard.compact()
+
+    def compact_in_background(self):
+        """Compacts every shard in a background thread"""
+        for shard in self.shards:
+            shard.compact_in_background()
+
+    def store_metrics(self):
+        """Returns the sum of the metrics of the shards"""
+        metrics = {}
+        for shard in self.shards:
+            for name, value in shard.store_metrics().items():
+                metrics[name] = metrics.get(name, 0) + value
+        return metrics
+
+    def save(self):
+        """Saves every shard as a new snapshot"""
+        for shard in self.shards:
+            shard.save()
+
+    def _add_record(self, record, durable=True):
+        """Adds the record to its shard"""
+        self._shard(record.get(self._ID_FIELD))._add_record(record, durable)
+
+    def add_item(self, item, buffered=False):
+        """Adds the item to its shard, writing it holding the lock of the shard"""
+        shard = self._shard(item.__dict__.get(self._ID_FIELD))
+        buffered = buffered or shard._DURABILITY == "buffered"
+        with self._validation_locked():
+            with shard._locked():
+                self._validate_item(item)
+                ticket = shard._stage_record(item.__dict__)
+                if not buffered:
+                    shard._write_pending()
+        shard._commit_log_entry(ticket, buffered=buffered)
+
+    def add_items(self, items):
+        """Adds a batch of items to their shards, syncing each changed shard once,
+        returns an ItemResult per item"""
+        results = []
+        changed_shards = []
+        with self._validation_locked():
+            for item in self._valid_items(items, results):
+                shard = self._shard(item.__dict__.get(self._ID_FIELD))
+                shard._stage_record(item.__dict__)
+                if shard not in changed_shards:
+                    changed_shards.append(shard)
+            for shard in changed_shards:
+                if shard._DURABILITY != "buffered":
+                    with shard._locked():
+                        shard._write_pending()
+        for shard in changed_shards:
+            shard._commit_log_entry(shard._appended_count)
+        return results
+
+    def find_item(self, key_value, key=None):
+        """Finds the first item with the key_value in the shards where it can be"""
+        for shard in self._key_shards(key_value, key):
+            item = shard.find_item(key_value, key)
+            if item is not None:
+                return item
+        return None
+
+    def _erase_record(self, key_value, key, durable=True):
+        """Erases the first item with the key_value in the shards where it can be"""
+        self._operation_store("erase", (key_value, key))._erase_record(key_value, key, durable)
+
+    def find_items_list(self, key_value, key=None):
+        """Finds all the items with the key_value in the shards where they can be"""
+        return [item for shard in self._key_shards(key_value, key)
+                for item in shard.find_items_list(key_value, key)]
+
+    def iter_items(self, predicate=None):
+        """Yields the items of every shard reading their files as a stream"""
+        for shard in self.shards:
+            yield from shard.iter_items(predicate)
+
+    def _operation_store(self, operation, payload):
+        """Returns the shard changed by an operation of a transaction"""
+        if operation == "add":
+            return self._shard(payload.get(self._ID_FIELD))
+        key_value, key = payload
+        shards = self._key_shards(key_value, key)
+        return next((shard for shard in shards if shard.find_item(key_value, key) is not None),
+                    shards[0])
+
+    def data_hash(self):
+        """Returns the root of a Merkle tree whose leaves are the digests of the shards"""
+        return hashlib.md5("".join(shard.data_hash() for shard in self.shards)
+                           .encode()).hexdigest()
+
+    def data_version(self):
+        """Returns the versions of the shards"""
+        return tuple(shard.data_version() for shard in self.shards)
+
+    def differing_shards(self, other):
+        """Returns the numbers of the shards whose content differs from the other store's"""
+        if self.data_hash() == other.data_hash():
+            return []
+        return [number for number, (shard, other_shard)
+                in enumerate(zip(self.shards, other.shards))
+                if shard.data_hash() != other_shard.data_hash()]
+
+    def differing_items(self, other):
+        """Returns the items only in this store and the items only in the other one
+
+        Only the shards with different digests are compared."""
+        own_items, other_items = [], []
+        for number in self.differing_shards(other):
+            own_digests = {self.record_digest(item): item
+                           for item in self.shards[number]._data_list}
+            other_digests = {self.record_digest(item): item
+                             for item in other.shards[number]._data_list}
+            own_items += [item for digest, item in own_digests.items()
+                          if digest not in other_digests]
+            other_items += [item for digest, item in other_digests.items()
+                            if digest not in own_digests]
+        return own_items, other_items
+
+    def delete_json_file(self):
+        """deletes the json files of every shard"""
+        for shard in self.shards:
+            shard.delete_json_file()
+        self._store_lock.close()
+
+    def empty_json_file(self):
+        """removes all data from every shard"""
+        for shard in self.shards:
+            shard.empty_json_file()
@@ -0,0 +1,30 @@
+"""Superclass of the stores implementing the singleton pattern"""
+import threading
+
+
+# pylint: disable=too-few-public-methods
+class SingletonStore:
+    """Implements the singleton pattern for the store class in _STORE_CLASS
+
+    Every subclass has its only store, created the first time it is requested."""
+    _STORE_CLASS = None
+    instance = None
+    _instance_lock = threading.Lock()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.instance = None
+        cls._instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if not cls.instance:
+            with cls._instance_lock:
+                if not cls.instance:
+                    cls.instance = cls._STORE_CLASS()
+        return cls.instance
+
+    def __getattr__(self, name):
+        return getattr(self.instance, name)
+
+    def __setattr__(self, name, value):
+        return setattr(self.instance, name, value)
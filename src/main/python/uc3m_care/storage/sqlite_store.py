@@ -0,0 +1,283 @@
+"""Superclass for managing storage in a SQLite database"""
+import json
+import os
+import sqlite3
+import threading
+
+from uc3m_care.cfg.vaccine_manager_config import SQLITE_FILE_PATH
+from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
+from uc3m_care.storage.json_store import JsonStore
+
+
+class SqliteStore(JsonStore):
+    """Implements the JsonStore methods with a table of a SQLite database
+
+    Every store is a table of the database in _DB_PATH, named after its JSON
+    file. The value of _ID_FIELD is kept in its own indexed column and the
+    fields in _INDEX_FIELDS get an index on their JSON expression. The
+    database runs in WAL mode, so readers are not blocked by a writer. Each
+    thread has its own connection, so the transactions of the threads are
+    isolated by SQLite. Every row keeps the digest of its item, and triggers
+    keep the sum of them in the store_digests table, so data_hash does not
+    read the items.
+    """
+    _DB_PATH = SQLITE_FILE_PATH
+    # the digests fit in the integers of SQLite, and so do the sums of two of them
+    _DIGEST_MODULUS = 2 ** 62
+    # connections of each thread by database path
+    _connections = threading.local()
+
+    @property
+    def _table(self):
+        """Name of the table of the store"""
+        return os.path.splitext(os.path.basename(self._FILE_PATH))[0]
+
+    @property
+    def _connection(self):
+        """Returns the connection of the thread to the database, shared by all the stores"""
+        connections = vars(SqliteStore._connections)
+        if self._DB_PATH not in connections:
+            try:
+                connection = sqlite3.connect(self._DB_PATH, timeout=30, isolation_level=None)
+            except sqlite3.OperationalError as ex:
+                raise VaccineManagementException("Wrong file or file path") from ex
+            connection.execute("PRAGMA journal_mode=WAL")
+            # in WAL mode NORMAL only loses the last commits if the system crashes
+            connection.execute("PRAGMA synchronous=" +
+                               ("NORMAL" if self._DURABILITY == "buffered" else "FULL"))
+            connections[self._DB_PATH] = connection
+        return connections[self._DB_PATH]
+
+    def _field_expression(self, field):
+        """SQL expression for a field of the JSON items, which are lists of values
+        when the store has a schema or objects if written by previous versions"""
+        expression = "json_extract(item, '$.\"" + field + "\"')"
+        if self._RECORD_SCHEMA is None or field not in self._RECORD_SCHEMA.keys:
+            return expression
+        return "coalesce(json_extract(item, '$[" + \
+            str(self._RECORD_SCHEMA.keys.index(field)) + "]'), " + expression + ")"
+
+    def _key_expression(self, key):
+        """SQL expression for the key used in a search"""
+        if key is None or key == self._ID_FIELD:
+            return "id_value"
+        return self._field_expression(key)
+
+    def load(self):
+        """Creates the table and the indexes of the store if they do not exist"""
+        connection = self._connection
+        connection.execute('CREATE TABLE IF NOT EXISTS "' + self._table + '" '
+                           '(position INTEGER PRIMARY KEY AUTOINCREMENT, '
+                           'id_value, item TEXT NOT NULL, digest INTEGER)')
+        connection.execute('CREATE INDEX IF NOT EXISTS "' + self._table + '_id" '
+                           'ON "' + self._table + '" (id_value)')
+        for number, field in enumerate(self._INDEX_FIELDS):
+            connection.execute('CREATE INDEX IF NOT EXISTS "' + self._table + "_field" +
+                               str(number) + '" ON "' + self._table + '" (' +
+                               self._field_expression(field) + ")")
+        connection.execute("CREATE TABLE IF NOT EXISTS store_digests "
+                           "(name TEXT PRIMARY KEY, digest INTEGER NOT NULL)")
+        if connection.execute("SELECT 1 FROM store_digests WHERE name = ?",
+                               (self._table,)).fetchone() is None:
+            self._create_digest()
+
+    def _create_digest(self):
+        """Computes the digest of the rows of a table created by a previous version and
+        creates the triggers that keep it as the rows are inserted and deleted"""
+        connection = self._connection
+        begin = not connection.in_transaction
+        if begin:
+            connection.execute("BEGIN IMMEDIATE")
+        try:
+            columns = [row[1] for row in
+                       connection.execute('PRAGMA table_info("' + self._table + '")')]
+            if "digest" not in columns:
+                connection.execute('ALTER TABLE "' + self._table + '" ADD COLUMN digest INTEGER')
+            rows = connection.execute('SELECT position, item FROM "' + self._table +
+                                      '" WHERE digest IS NULL').fetchall()
+            connection.executemany(
+                'UPDATE "' + self._table + '" SET digest = ? WHERE position = ?',
+                [(self._row_digest(self._compact_record(json.loads(item))), position)
+                 for position, item in rows])
+            connection.execute(
+                "INSERT OR IGNORE INTO store_digests (name, digest) "
+                'SELECT ?, coalesce(sum(digest) % ?, 0) FROM "' + self._table + '"',
+                (self._table, self._DIGEST_MODULUS))
+            modulus = str(self._DIGEST_MODULUS)
+            connection.execute(
+                'CREATE TRIGGER IF NOT EXISTS "' + self._table + '_add" AFTER INSERT ON "' +
+                self._table + '" BEGIN UPDATE store_digests SET digest = '
+                "(digest + NEW.digest) % " + modulus + " WHERE name = '" + self._table +
+                "'; END")
+            connection.execute(
+                'CREATE TRIGGER IF NOT EXISTS "' + self._table + '_erase" AFTER DELETE ON "' +
+                self._table + '" BEGIN UPDATE store_digests SET digest = '
+                "(digest - OLD.digest + " + modulus + ") % " + modulus +
+                " WHERE name = '" + self._table + "'; END")
+        except BaseException:
+            if begin:
+                connection.execute("ROLLBACK")
+            raise
+        if begin:
+            connection.execute("COMMIT")
+
+    def _row_digest(self, record):
+        """Returns the digest of a record kept in its row"""
+        return self.record_digest(record) % self._DIGEST_MODULUS
+
+    def save(self):
+        """Every change is committed to the database when it is made"""
+
+    def flush(self):
+        """Every change is committed to the database when it is made"""
+
+    def compact(self):
+        """Moves the WAL file into the database"""
+        self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def compact_in_background(self):
+        """Moves the WAL file into the database, SQLite reuses the pages of deleted rows"""
+        self.compact()
+
+    def store_metrics(self):
+        """Returns the number of records of the table, deleted rows leave no records"""
+        self.load()
+        live_records = self._connection.execute(
+            'SELECT count(*) FROM "' + self._table + '"').fetchone()[0]
+        return {"live_records": live_records, "dead_records": 0,
+                "snapshot_records": live_records, "log_additions": 0,
+                "log_tombstones": 0, "log_bytes": 0}
+
+    @property
+    def _data_list(self):
+        """Returns all the items of the store"""
+        self.load()
+        return [self._compact_record(json.loads(row[0])) for row in self._connection.execute(
+            'SELECT item FROM "' + self._table + '" ORDER BY position')]
+
+    # pylint: disable=unused-argument
+    def _add_record(self, record, durable=True):
+        """Inserts a new record in the table, durable as configured for the database"""
+        self.load()
+        record = self._compact_record(record)
+        self._connection.execute('INSERT INTO "' + self._table + '" (id_value, item, digest) '
+                                 'VALUES (?, ?, ?)',
+                                 (record.get(self._ID_FIELD), json.dumps(record),
+                                  self._row_digest(record)))
+
+    # pylint: disable=unused-argument
+    def add_item(self, item, buffered=False):
+        """Validates and inserts the item in a database transaction that holds the
+        write lock, so two threads or processes cannot add it
+
+        The durability of the inserts is the one configured for the database."""
+        connection = self._connection
+        with self._write_lock:
+            self.load()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._validate_item(item)
+                self._add_record(item.__dict__)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def add_items(self, items):
+        """Adds a batch of items in a single database transaction, validating each of
+        them against the items already added, returns an ItemResult per item"""
+        results = []
+        connection = self._connection
+        with self._write_lock:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for item in self._valid_items(items, results):
+                    self._add_record(item.__dict__)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        return results
+
+    def find_item(self, key_value, key=None):
+        """Finds the first item with the key_value in the table"""
+        self.load()
+        row = self._connection.execute(
+            'SELECT item FROM "' + self._table + '" WHERE ' + self._key_expression(key) +
+            " = ? ORDER BY position LIMIT 1", (key_value,)).fetchone()
+        return None if row is None else self._compact_record(json.loads(row[0]))
+
+    # pylint: disable=unused-argument
+    def _erase_record(self, key_value, key, durable=True):
+        """Erases the first record with the key_value from the table"""
+        self.load()
+        self._connection.execute(
+            'DELETE FROM "' + self._table + '" WHERE position = (SELECT position FROM "' +
+            self._table + '" WHERE ' + self._key_expression(key) +
+            " = ? ORDER BY position LIMIT 1)", (key_value,))
+
+    def find_items_list(self, key_value, key=None):
+        """Finds all the items with the key_value in the table"""
+        self.load()
+        return [self._compact_record(json.loads(row[0])) for row in self._connection.execute(
+            'SELECT item FROM "' + self._table + '" WHERE ' + self._key_expression(key) +
+            " = ? ORDER BY position", (key_value,))]
+
+    def iter_items(self, predicate=None):
+        """Yields the items of the table, or the ones the predicate is true for,
+        fetching the rows as they are needed"""
+        self.load()
+        for row in self._connection.cursor().execute(
+                'SELECT item FROM "' + self._table + '" ORDER BY position'):
+            item = self._compact_record(json.loads(row[0]))
+            if predicate is None or predicate(item):
+                yield item
+
+    def delete_json_file(self):
+        """removes all the items of the store"""
+        self.empty_json_file()
+
+    def empty_json_file(self):
+        """removes all the items of the store"""
+        self.load()
+        self._connection.execute('DELETE FROM "' + self._table + '"')
+
+    def data_hash(self):
+        """Returns the digest of the store's content, kept by the triggers of the table"""
+        self.load()
+        return format(self._connection.execute(
+            "SELECT digest FROM store_digests WHERE name = ?",
+            (self._table,)).fetchone()[0], "016x")
+
+    def data_version(self):
+        """Returns a value that changes whenever the content of the store changes
+
+        The rows are only inserted, with increasing positions, and deleted, so
+        the last position given and the number of rows change with every change."""
+        self.load()
+        return self._connection.execute(
+            'SELECT (SELECT seq FROM sqlite_sequence WHERE name = ?), count(*) FROM "' +
+            self._table + '"', (self._table,)).fetchone()
+
+    # pylint: disable=protected-access
+    def commit_transaction(self, operations):
+        """Commits the operations of a transaction in a single database transaction"""
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for store, operation, payload in operations:
+                if operation == "add":
+                    store._add_record(payload)
+                else:
+                    store._erase_record(*payload)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def recover_transactions(self):
+        """SQLite recovers its own transactions"""
+
+    def checkpoint_transactions(self):
+        """Moves the WAL file into the database"""
+        self.compact()
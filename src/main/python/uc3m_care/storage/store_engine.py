@@ -0,0 +1,17 @@
+"""Selects the storage engine of the stores from the configuration"""
+from uc3m_care.cfg.vaccine_manager_config import STORE_ENGINE
+from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
+from uc3m_care.storage.json_store import JsonStore
+from uc3m_care.storage.sharded_json_store import ShardedJsonStore
+from uc3m_care.storage.sqlite_store import SqliteStore
+
+STORE_ENGINES = {"json": JsonStore,
+                 "sharded": ShardedJsonStore,
+                 "sqlite": SqliteStore}
+
+
+def store_engine():
+    """Returns the superclass of the stores for the configured engine"""
+    if STORE_ENGINE not in STORE_ENGINES:
+        raise VaccineManagementException("Unknown store engine: " + STORE_ENGINE)
+    return STORE_ENGINES[STORE_ENGINE]
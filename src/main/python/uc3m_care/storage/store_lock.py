@@ -0,0 +1,82 @@
+"""Lock of a store shared by the processes using its files"""
+import mmap
+import os
+import struct
+
+try:
+    import fcntl
+except ImportError:
+    # advisory locks are not available on Windows, there only threads are locked
+    fcntl = None
+
+
+class StoreLock:
+    """Advisory lock file of a store holding a counter of its changes
+
+    The file is locked with flock, shared while the store is read and
+    exclusive while its files are changed. Its first bytes are a counter
+    increased by every process changing the store; the counter is mapped in
+    memory, so checking if another process has changed the store is a memory
+    read instead of a stat of its files. The threads of a process must be
+    serialized by the caller, which can nest acquire and release calls."""
+    _COUNTER = struct.Struct("<Q")
+
+    def __init__(self, path):
+        self._path = path
+        self._file = None
+        self._counter = None
+        self._depth = 0
+        self._exclusive = False
+
+    def _open(self):
+        """Opens and maps the lock file, returns False if its folder does not exist"""
+        if self._file is None:
+            try:
+                # pylint: disable=consider-using-with
+                file = open(self._path, "a+b")
+            except FileNotFoundError:
+                return False
+            if os.fstat(file.fileno()).st_size < self._COUNTER.size:
+                file.truncate(self._COUNTER.size)
+            self._counter = mmap.mmap(file.fileno(), self._COUNTER.size)
+            self._file = file
+        return True
+
+    def acquire(self, exclusive):
+        """Locks the file, shared or exclusive, unless it is already locked that way"""
+        if self._open() and fcntl is not None and \
+                (self._depth == 0 or (exclusive and not self._exclusive)):
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._exclusive = exclusive
+        self._depth += 1
+
+    def release(self):
+        """Unlocks the file when the outermost acquire is released"""
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None and fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._exclusive = False
+
+    def close(self):
+        """Unmaps and closes the lock file unless it is locked; it is opened
+        again when the lock is used"""
+        if self._depth == 0 and self._file is not None:
+            self._counter.close()
+            self._file.close()
+            self._counter = None
+            self._file = None
+
+    def generation(self):
+        """Returns the number of changes made to the store, None if it has no folder"""
+        if not self._open():
+            return None
+        return self._COUNTER.unpack_from(self._counter)[0]
+
+    def increase_generation(self):
+        """Counts a change made to the store while it is locked exclusively,
+        returns the new number of changes"""
+        if not self._open():
+            return None
+        generation = self._COUNTER.unpack_from(self._counter)[0] + 1
+        self._COUNTER.pack_into(self._counter, 0, generation)
+        return generation
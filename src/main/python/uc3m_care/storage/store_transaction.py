@@ -0,0 +1,42 @@
+"""Unit of work for changing several stores at once"""
+# pylint: disable=protected-access
+
+
+class StoreTransaction:
+    """Collects the changes to several stores and commits them together
+
+    Used as a context manager, the changes are committed when the block ends
+    without an exception and discarded otherwise."""
+
+    def __init__(self):
+        self._operations = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def add_item(self, store, item):
+        """Adds the item to the store when the transaction is committed"""
+        store._validate_item(item)
+        self._operations.append((store, "add", item.__dict__))
+
+    def erase_item(self, store, key_value, key=None):
+        """Erases the item from the store when the transaction is committed"""
+        self._operations.append((store, "erase", (key_value, store._ID_FIELD if key is None
+                                                  else key)))
+
+    def commit(self):
+        """Commits the changes of the transaction to the stores"""
+        if self._operations:
+            store = self._operations[0][0]
+            store.commit_transaction(self._operations)
+        self._operations = []
+
+    def rollback(self):
+        """Discards the changes of the transaction"""
+        self._operations = []
@@ -1,36 +1,27 @@
 """Subclass of JsonStore for managing the VaccinationLog"""
 
-from uc3m_care.storage.json_store import JsonStore
+from uc3m_care.storage.store_engine import store_engine
+from uc3m_care.storage.singleton_store import SingletonStore
+from uc3m_care.storage.record_schema import VACCINATION_SCHEMA
 from uc3m_care.cfg.vaccine_manager_config import JSON_FILES_PATH
 from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
 
 
-class VaccinationJsonStore:
+class VaccinationJsonStore(SingletonStore):
     """Implementation of the singleton pattern"""
 
-    # pylint: disable=invalid-name
-    class __VaccinationJsonStore(JsonStore):
+    # pylint: disable=invalid-name, too-few-public-methods
+    class __VaccinationJsonStore(store_engine()):
         """Subclass of JsonStore for managing the VaccinationLog"""
         _FILE_PATH = JSON_FILES_PATH + "store_vaccine.json"
         _ID_FIELD = "_VaccinationLog__date_signature"
+        _RECORD_SCHEMA = VACCINATION_SCHEMA
 
-        def add_item(self, item):
-            """Overrides the add_item to verify the item to be stored"""
+        def _validate_item(self, item):
+            """Overrides the _validate_item to verify the item to be stored"""
             # pylint: disable=import-outside-toplevel, cyclic-import
             from uc3m_care.data.vaccination_log import VaccinationLog
             if not isinstance(item, VaccinationLog):
                 raise VaccineManagementException("Invalid VaccinationLog object")
-            super().add_item(item)
 
-    instance = None
-
-    def __new__(cls):
-        if not VaccinationJsonStore.instance:
-            VaccinationJsonStore.instance = VaccinationJsonStore.__VaccinationJsonStore()
-        return VaccinationJsonStore.instance
-
-    def __getattr__(self, nombre):
-        return getattr(self.instance, nombre)
-
-    def __setattr__(self, nombre, valor):
-        return setattr(self.instance, nombre, valor)
+    _STORE_CLASS = __VaccinationJsonStore
@@ -1,7 +1,12 @@
 """Module """
 
+import threading
 from uc3m_care.data.vaccine_patient_register import VaccinePatientRegister
 from uc3m_care.data.vaccination_appointment import VaccinationAppointment
+from uc3m_care.data.vaccination_day_roster import VaccinationDayRoster
+from uc3m_care.batch.patient_registration_import import PatientRegistrationImport
+from uc3m_care.batch.vaccine_date_batch import VaccineDateBatch
+from uc3m_care.batch.cancellation_batch import CancellationBatch
 
 
 class VaccineManager:
@@ -29,6 +34,11 @@ class VaccineManager:
             my_patient.save_patient()
             return my_patient.patient_sys_id
 
+        def request_vaccination_ids_from_file(self, input_file, results_file):
+            """Registers the patients of a CSV or JSONL file, writing the patient_sys_id
+            or the error of every row in the results file"""
+            return PatientRegistrationImport(input_file, results_file).run()
+
         def get_vaccine_date(self, input_file, date: str):
             """Gets an appointment for a registered patient"""
 
@@ -38,20 +48,39 @@ class VaccineManager:
             my_sign.save_appointment()
             return my_sign.date_signature
 
+        def get_vaccine_dates(self, requests, date: str = None):
+            """Gets the appointments of a batch of requests: (input_file, date) pairs,
+            a manifest file of them, or a directory or glob of input files for the date;
+            returns every (input_file, date) request with its result, in their order"""
+            return VaccineDateBatch.from_source(requests, date).run()
+
         def cancel_appointment(self, input_file):
             date_signature = VaccinationAppointment.cancel_appointment_from_json_file(input_file)
             return date_signature
 
+        def cancel_appointments(self, inputs):
+            """Cancels the appointments of a list of input files, or of the lines of a
+            JSONL file, in one transaction; returns the name and the result of every
+            input in their order"""
+            return CancellationBatch(inputs).run()
+
         def vaccine_patient(self, date_signature):
             """Register the vaccination of the patient"""
             appointment = VaccinationAppointment.get_appointment_from_date_signature(date_signature)
             return appointment.register_vaccination()
 
+        def open_vaccination_day(self):
+            """Returns the roster of today's appointments, for checking in their patients"""
+            return VaccinationDayRoster()
+
     instance = None
+    _instance_lock = threading.Lock()
 
     def __new__(cls):
         if not VaccineManager.instance:
-            VaccineManager.instance = VaccineManager.__VaccineManager()
+            with VaccineManager._instance_lock:
+                if not VaccineManager.instance:
+                    VaccineManager.instance = VaccineManager.__VaccineManager()
         return VaccineManager.instance
 
     def __getattr__(self, nombre):
@@ -0,0 +1,37 @@
+"""Items and test case shared by the tests of the storage engines"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+
+# pylint: disable=too-few-public-methods
+class StoreItem:
+    """Item to be saved in the test store"""
+    def __init__(self, item_id, value):
+        self.item_id = item_id
+        self.value = value
+
+
+class StoreTestCase(TestCase):
+    """Test case with a store of StoreItem saved in a temporary folder
+
+    The store is a subclass of store_base with the attributes returned by
+    store_attributes, created again for every test. Its entries are synced
+    as they are written whatever the durability configured, as the tests
+    look at its files; the tests of the buffered durability set it."""
+    store_base = None
+
+    def store_attributes(self):
+        """Returns the class attributes of the store of the test"""
+        return {"_FILE_PATH": os.path.join(self.folder, "store_items.json"),
+                "_ID_FIELD": "item_id", "_DURABILITY": "sync"}
+
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.store_class = type("Items" + self.store_base.__name__, (self.store_base,),
+                                self.store_attributes())
+        self.store = self.store_class()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
@@ -0,0 +1,58 @@
+"""Tests for the asyncio facade of VaccineManager"""
+import asyncio
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_care import AsyncVaccineManager
+from uc3m_care import VaccineManagementException
+from uc3m_care import JSON_FILES_RF2_PATH, JSON_FILES_FP_PATH
+from uc3m_care import AppointmentsJsonStore
+from uc3m_care import VaccinationJsonStore
+from uc3m_care import PatientsJsonStore
+from uc3m_care import CancellationJsonStore
+from uc3m_care import FinalCancelledAppointmentJsonStore
+from uc3m_care import TemporalCancelledAppointmentJsonStore
+
+
+class TestAsyncVaccineManager(TestCase):
+    """Unit tests for AsyncVaccineManager"""
+
+    def setUp(self) -> None:
+        for store in (PatientsJsonStore(), AppointmentsJsonStore(), VaccinationJsonStore(),
+                      CancellationJsonStore(),
+                      FinalCancelledAppointmentJsonStore(),
+                      TemporalCancelledAppointmentJsonStore()):
+            store.delete_json_file()
+
+    @freeze_time("2022-03-08")
+    def test_async_cancel_appointment_ok(self):
+        """the operations run in the executor return the values of VaccineManager"""
+        async def cancel_appointment():
+            my_manager = AsyncVaccineManager(max_concurrency=2)
+            patient_sys_id = await my_manager.request_vaccination_id(
+                "78924cb0-075a-4099-a3ee-f3b562e805b9", "minombre tienelalongitudmaxima",
+                "Regular", "+34123456789", "6")
+            date_signature = await my_manager.get_vaccine_date(
+                JSON_FILES_RF2_PATH + "test_ok.json", "2022-03-18")
+            cancelled = await my_manager.cancel_appointment(JSON_FILES_FP_PATH + "test_ok.json")
+            return patient_sys_id, date_signature, cancelled
+
+        patient_sys_id, date_signature, cancelled = asyncio.run(cancel_appointment())
+        self.assertEqual(patient_sys_id, "72b72255619afeed8bd26861a2bc2caf")
+        self.assertEqual(date_signature, cancelled)
+
+    @freeze_time("2022-03-08")
+    def test_async_same_patient_is_registered_once(self):
+        """the concurrent registrations of the same patient run one after the other"""
+        async def register_patient():
+            my_manager = AsyncVaccineManager()
+            return await asyncio.gather(
+                *[my_manager.request_vaccination_id(
+                    "78924cb0-075a-4099-a3ee-f3b562e805b9", "minombre tienelalongitudmaxima",
+                    "Regular", "+34123456789", "6") for _ in range(4)],
+                return_exceptions=True)
+
+        results = asyncio.run(register_patient())
+        self.assertEqual(results[0], "72b72255619afeed8bd26861a2bc2caf")
+        for result in results[1:]:
+            self.assertIsInstance(result, VaccineManagementException)
+            self.assertEqual(result.message, "patien_id is registered in store_patient")
@@ -0,0 +1,107 @@
+"""Tests for the bulk registration of patients"""
+import csv
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_care import VaccineManager
+from uc3m_care import VaccineManagementException
+from uc3m_care import PatientsJsonStore
+from uc3m_care.batch.patient_registration_import import PatientRegistrationImport
+
+
+class TestBulkRegistration(TestCase):
+    """Unit tests for request_vaccination_ids_from_file in VaccineManager"""
+
+    def setUp(self) -> None:
+        PatientsJsonStore().delete_json_file()
+        self.folder = tempfile.mkdtemp()
+        self.results_file = os.path.join(self.folder, "results.csv")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
+
+    def read_results(self):
+        """Returns the rows of the results file"""
+        with open(self.results_file, "r", encoding="utf-8", newline="") as file:
+            return list(csv.DictReader(file))
+
+    @freeze_time("2022-03-08")
+    def test_bulk_registration_csv(self):
+        """the valid rows are registered and the duplicated and wrong ones reported"""
+        input_file = os.path.join(self.folder, "patients.csv")
+        with open(input_file, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["patient_id", "full_name", "registration_type",
+                             "phone_number", "age"])
+            writer.writerow(["78924cb0-075a-4099-a3ee-f3b562e805b9",
+                             "minombre tienelalongitudmaxima", "Regular", "+34123456789", "6"])
+            writer.writerow(["78924cb0-075a-4099-a3ee-f3b562e805b9",
+                             "minombre tienelalongitudmaxima", "Regular", "+34123456789", "6"])
+            writer.writerow(["zb0506db-50de-493b-abf9-1fb44816b628",
+                             "minombre tieneuncharmenosqmax", "Family", "+34333456789", "7"])
+            writer.writerow(["57c811e5-3f5a-4a89-bbb8-11c0464d53e6",
+                             "minombre tieneuncharmenosqmax", "Family", "+34333456789"])
+        summary = VaccineManager().request_vaccination_ids_from_file(input_file,
+                                                                     self.results_file)
+        self.assertEqual(summary, {"registered": 1, "errors": 3})
+        results = self.read_results()
+        self.assertEqual(results[0]["patient_sys_id"], "72b72255619afeed8bd26861a2bc2caf")
+        self.assertEqual([result["error"] for result in results[1:]],
+                         ["patien_id is registered in store_patient",
+                          "Id received is not a UUID", "Bad label age"])
+        self.assertIsNotNone(PatientsJsonStore().find_item("72b72255619afeed8bd26861a2bc2caf"))
+
+    @freeze_time("2022-03-08")
+    def test_bulk_registration_jsonl_in_chunks(self):
+        """the rows of a JSONL file are registered in several chunks"""
+        input_file = os.path.join(self.folder, "patients.jsonl")
+        rows = [{"patient_id": "78924cb0-075a-4099-a3ee-f3b562e805b9",
+                 "full_name": "minombre tienelalongitudmaxima", "registration_type": "Regular",
+                 "phone_number": "+34123456789", "age": 6},
+                {"patient_id": "57c811e5-3f5a-4a89-bbb8-11c0464d53e6",
+                 "full_name": "minombre tieneuncharmenosqmax", "registration_type": "Family",
+                 "phone_number": "+34333456789", "age": "7"}]
+        with open(input_file, "w", encoding="utf-8") as file:
+            for row in rows:
+                file.write(json.dumps(row) + "\n")
+            file.write("{not json\n")
+        summary = PatientRegistrationImport(input_file, self.results_file, 1).run()
+        self.assertEqual(summary, {"registered": 2, "errors": 1})
+        results = self.read_results()
+        self.assertEqual([result["patient_sys_id"] for result in results[:2]],
+                         ["72b72255619afeed8bd26861a2bc2caf", "0d49256644b963208cb8db044a3ebbe7"])
+        self.assertEqual(results[2]["error"], "JSON Decode Error - Wrong JSON Format")
+
+    def test_bulk_registration_file_not_found(self):
+        """a missing input file raises an exception"""
+        with self.assertRaises(VaccineManagementException) as context_manager:
+            VaccineManager().request_vaccination_ids_from_file(
+                os.path.join(self.folder, "missing.csv"), self.results_file)
+        self.assertEqual(context_manager.exception.message, "File is not found")
+
+    def test_bulk_registration_worker_processes(self):
+        """the patients built by worker processes are registered in the order of the file"""
+        input_file = os.path.join(self.folder, "patients.csv")
+        patient_ids = ["78924cb0-075a-4099-a3ee-f3b562e805b9",
+                       "57c811e5-3f5a-4a89-bbb8-11c0464d53e6",
+                       "cde0bc01-5bc7-4c0c-90d6-94c9549e6abd",
+                       "a729d963-e0dd-47d0-8bc6-b6c595ad0098",
+                       "bb5dbd6f-d8b4-113f-8eb9-dd262cfc54e0"]
+        with open(input_file, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["patient_id", "full_name", "registration_type",
+                             "phone_number", "age"])
+            for patient_id in patient_ids + patient_ids[:1]:
+                writer.writerow([patient_id, "minombre tienelalongitudmaxima", "Regular",
+                                 "+34123456789", "6"])
+        summary = PatientRegistrationImport(input_file, self.results_file, 1, 2).run()
+        self.assertEqual(summary, {"registered": 4, "errors": 2})
+        results = self.read_results()
+        self.assertEqual([result["row"] for result in results], ["1", "2", "3", "4", "5", "6"])
+        self.assertEqual([result["error"] for result in results[4:]],
+                         ["UUID invalid", "patien_id is registered in store_patient"])
+        for result in results[:4]:
+            self.assertIsNotNone(PatientsJsonStore().find_item(result["patient_sys_id"]))
@@ -1,5 +1,6 @@
 """Tests for cancel_appointment method"""
 from unittest import TestCase
+import json
 import os
 from freezegun import freeze_time
 from uc3m_care import VaccineManager
@@ -53,6 +54,26 @@ class TestCancelAppointment(TestCase):
 
         self.assertEqual(value, date_signature)
 
+    @freeze_time("2022-03-08")
+    def test_cancel_appointment_updates_all_stores(self):
+        """The appointment is moved and the cancellation stored in one transaction"""
+        vaccine_date_file = JSON_FILES_RF2_PATH + "test_ok.json"
+        test_file = JSON_FILES_FP_PATH + "test_ok.json"
+        my_manager = VaccineManager()
+        my_manager.request_vaccination_id("78924cb0-075a-4099-a3ee-f3b562e805b9",
+                                          "minombre tienelalongitudmaxima",
+                                          "Regular", "+34123456789", "6")
+        value = my_manager.get_vaccine_date(vaccine_date_file, "2022-03-18")
+
+        my_manager.cancel_appointment(test_file)
+
+        self.assertIsNone(AppointmentsJsonStore().find_item(value))
+        self.assertIsNotNone(TemporalCancelledAppointmentJsonStore().find_item(value))
+        self.assertIsNotNone(CancellationJsonStore().find_item(value))
+        with self.assertRaises(VaccineManagementException) as c_m:
+            my_manager.cancel_appointment(test_file)
+        self.assertEqual(c_m.exception.message, "date_signature is not found")
+
     @freeze_time("2022-03-08")
     def test_syntax_nok(self):
         """Loops through nok files to retrieve an exception"""
@@ -78,3 +99,52 @@ class TestCancelAppointment(TestCase):
                 with self.assertRaises(VaccineManagementException) as c_m:
                     date_signature = my_manager.cancel_appointment(file_path)
                 self.assertEqual(c_m.exception.message, error_message)
+
+    @freeze_time("2022-03-08")
+    def test_cancel_appointments_batch(self):
+        """the cancellations of a JSONL file are committed together"""
+        my_manager = VaccineManager()
+        my_manager.request_vaccination_id("78924cb0-075a-4099-a3ee-f3b562e805b9",
+                                          "minombre tienelalongitudmaxima",
+                                          "Regular", "+34123456789", "6")
+        value = my_manager.get_vaccine_date(JSON_FILES_RF2_PATH + "test_ok.json", "2022-03-18")
+        jsonl_file = os.path.join(JSON_FILES_PATH, "cancellations.jsonl")
+        cancellation = {"date_signature": value, "cancellation_type": "Final",
+                        "reason": "clinic closed"}
+        with open(jsonl_file, "w", encoding="utf-8") as file:
+            file.write(json.dumps(cancellation) + "\n")
+            file.write(json.dumps(cancellation) + "\n")
+            file.write(json.dumps({"date_signature": value}) + "\n")
+            file.write(json.dumps({"date_signature": 12345, "cancellation_type": "Final",
+                                   "reason": "clinic closed"}) + "\n")
+            file.write(json.dumps([value, "Final", "clinic closed"]) + "\n")
+        try:
+            results = my_manager.cancel_appointments(jsonl_file)
+        finally:
+            os.remove(jsonl_file)
+        self.assertEqual(results[0][1], value)
+        self.assertEqual(results[1][1].message,
+                         "The appointment was already cancelled")
+        self.assertEqual(results[2][1].message, "Invalid cancellation_type")
+        self.assertEqual(results[3][1].message, "date_signature format is not valid")
+        self.assertEqual(results[4][1].message,
+                         "JSON Decode Error - Wrong JSON Format")
+        self.assertIsNone(AppointmentsJsonStore().find_item(value))
+        self.assertIsNotNone(FinalCancelledAppointmentJsonStore().find_item(value))
+        self.assertIsNotNone(CancellationJsonStore().find_item(value))
+        results = my_manager.cancel_appointments([JSON_FILES_FP_PATH + "test_ok.json"])
+        self.assertEqual(results[0][1].message, "date_signature is not found")
+
+    @freeze_time("2022-03-08")
+    def test_cancel_appointments_batch_same_input_twice(self):
+        """an input given twice gets the result of each of its cancellations"""
+        my_manager = VaccineManager()
+        my_manager.request_vaccination_id("78924cb0-075a-4099-a3ee-f3b562e805b9",
+                                          "minombre tienelalongitudmaxima",
+                                          "Regular", "+34123456789", "6")
+        value = my_manager.get_vaccine_date(JSON_FILES_RF2_PATH + "test_ok.json", "2022-03-18")
+        input_file = JSON_FILES_FP_PATH + "test_ok.json"
+        results = my_manager.cancel_appointments([input_file, input_file])
+        self.assertEqual([name for name, _ in results], [input_file, input_file])
+        self.assertEqual(results[0][1], value)
+        self.assertEqual(results[1][1].message, "The appointment was already cancelled")
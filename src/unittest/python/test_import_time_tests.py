@@ -0,0 +1,49 @@
+"""Module for testing the import time of the package"""
+import os
+import subprocess
+import sys
+import unittest
+from unittest import TestCase
+
+import uc3m_care
+
+# cumulative microseconds of "import uc3m_care" reported by -X importtime
+IMPORT_TIME_BUDGET = 30000
+
+
+class TestImportTime(TestCase):
+    """Class for testing the lazy import of the package"""
+
+    @staticmethod
+    def run_python(code):
+        """Runs the code in a new interpreter, returns its output and its import times"""
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                 capture_output=True, text=True, env=environment, check=True)
+        return process.stdout, process.stderr
+
+    def test_import_within_budget(self):
+        """importing the package loads neither the stores nor freezegun"""
+        output, import_times = self.run_python(
+            "import sys, uc3m_care; print(sorted(m for m in sys.modules "
+            "if m.startswith('uc3m_care.') or m.startswith('freezegun')))")
+        self.assertEqual(output.strip(), "[]")
+        package_line = [line for line in import_times.splitlines()
+                        if line.endswith("| uc3m_care")][-1]
+        cumulative = int(package_line.split("|")[1])
+        self.assertLess(cumulative, IMPORT_TIME_BUDGET)
+
+    def test_names_imported_when_used(self):
+        """the names of the package are imported the first time they are used"""
+        output, _ = self.run_python(
+            "import sys\nfrom uc3m_care import VaccineManagementException\n"
+            "print('uc3m_care.vaccine_manager' in sys.modules, "
+            "'freezegun' in sys.modules)")
+        self.assertEqual(output.strip(), "False False")
+        self.assertIs(uc3m_care.VaccineManager, uc3m_care.vaccine_manager.VaccineManager)
+        with self.assertRaises(AttributeError):
+            getattr(uc3m_care, "NotAName")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,521 @@
+"""Tests for the JsonStore storage engine"""
+import json
+import multiprocessing
+import os
+import threading
+import time
+from unittest import mock
+
+from uc3m_care.exception.vaccine_management_exception import VaccineManagementException
+from uc3m_care.storage.json_store import JsonStore
+from uc3m_care.storage.record_schema import Record, RecordSchema
+from uc3m_care.storage.store_transaction import StoreTransaction
+from store_test_helpers import StoreItem, StoreTestCase
+
+
+# pylint: disable=too-few-public-methods
+class SchemaItem:
+    """Item with private attributes, saved with a record schema"""
+    def __init__(self, item_id, value):
+        self.__item_id = item_id
+        self.__value = value
+
+
+class CompactingJsonStore(JsonStore):
+    """Store compacted by the writer as soon as its log has some entries"""
+    _ID_FIELD = "item_id"
+    _DURABILITY = "sync"
+    _COMPACTION_MIN_BYTES = 512
+    _BACKGROUND_COMPACTION = False
+
+
+def add_store_items(file_path, first):
+    """Adds ten items to the store in a process"""
+    store = CompactingJsonStore(file_path)
+    for number in range(first, first + 10):
+        store.add_item(StoreItem("id" + str(number), number))
+
+
+class UniqueItemsJsonStore(JsonStore):
+    """Store that rejects the items whose item_id is already registered"""
+    _ID_FIELD = "item_id"
+    _DURABILITY = "sync"
+
+    def _validate_item(self, item):
+        if self.find_item(item.item_id) is not None:
+            raise VaccineManagementException("item_id is registered")
+
+
+def add_unique_items(file_path):
+    """Tries to add the same ten items to the store in a process"""
+    store = UniqueItemsJsonStore(file_path)
+    for number in range(10):
+        try:
+            store.add_item(StoreItem("id" + str(number), number))
+        except VaccineManagementException:
+            pass
+
+
+class TestJsonStore(StoreTestCase):
+    """Tests for the log structured JsonStore"""
+    store_base = JsonStore
+
+    def test_add_item_appends_to_log(self):
+        """add_item writes a line in the log and does not create the snapshot"""
+        self.store.add_item(StoreItem("a1", 1))
+        self.store.add_item(StoreItem("a2", 2))
+        self.assertFalse(os.path.isfile(self.store_class._FILE_PATH))
+        with open(self.store_class._FILE_PATH + ".log", "r", encoding="utf-8") as file:
+            self.assertEqual(len(file.readlines()), 3)
+        self.assertEqual(self.store_class().find_item("a2")["value"], 2)
+
+    def test_erase_item_appends_tombstone(self):
+        """erase_item records a tombstone that is honoured when loading"""
+        self.store.add_item(StoreItem("a1", 1))
+        self.store.add_item(StoreItem("a2", 2))
+        self.store.erase_item("a1")
+        new_store = self.store_class()
+        self.assertIsNone(new_store.find_item("a1"))
+        self.assertEqual(len(new_store.find_items_list(2, "value")), 1)
+
+    def test_compaction_folds_log_into_snapshot(self):
+        """a log bigger than the snapshot is compacted"""
+        self.store_class._COMPACTION_MIN_BYTES = 1024
+        self.store_class._BACKGROUND_COMPACTION = False
+        for number in range(100):
+            self.store.add_item(StoreItem("id" + str(number), number))
+        with open(self.store_class._FILE_PATH, "r", encoding="utf-8") as file:
+            snapshot = json.load(file)
+        self.assertGreater(len(snapshot), 0)
+        self.assertEqual(len(self.store_class().find_items_list(99, "value")), 1)
+        self.assertEqual(len(self.store_class()._data_list), 100)
+
+    def test_stale_log_is_ignored(self):
+        """the log is not applied to a snapshot replaced by another file"""
+        self.store.add_item(StoreItem("a1", 1))
+        with open(self.store_class._FILE_PATH, "w", encoding="utf-8") as file:
+            json.dump([{"item_id": "b1", "value": 5}], file)
+        new_store = self.store_class()
+        self.assertIsNone(new_store.find_item("a1"))
+        new_store.add_item(StoreItem("b2", 6))
+        self.assertEqual(len(self.store_class()._data_list), 2)
+
+    def test_truncated_last_line_is_ignored(self):
+        """a line cut by a crash at the end of the log is discarded"""
+        self.store.add_item(StoreItem("a1", 1))
+        with open(self.store_class._FILE_PATH + ".log", "a", encoding="utf-8") as file:
+            file.write('{"add": {"item_id": "a2"')
+        self.assertIsNone(self.store_class().find_item("a2"))
+        self.assertIsNotNone(self.store_class().find_item("a1"))
+
+    def test_indexes_follow_add_and_erase(self):
+        """the id and secondary indexes are kept consistent with the data list"""
+        self.store_class._INDEX_FIELDS = ["value"]
+        store = self.store_class()
+        store.add_item(StoreItem("a1", 1))
+        store.add_item(StoreItem("a2", 1))
+        store.add_item(StoreItem("a3", 2))
+        self.assertEqual(len(store.find_items_list(1, "value")), 2)
+        store.erase_item("a1")
+        self.assertEqual([item["item_id"] for item in store.find_items_list(1, "value")],
+                         ["a2"])
+        self.assertIsNone(store.find_item("a1"))
+        self.assertEqual(store.find_item(2, "value")["item_id"], "a3")
+        self.assertEqual(len(self.store_class().find_items_list(1, "value")), 1)
+
+    def test_unchanged_files_are_not_parsed_again(self):
+        """the data list is reused while the files do not change"""
+        self.store.add_item(StoreItem("a1", 1))
+        self.store.empty_json_file()
+        self.store.add_item(StoreItem("a2", 2))
+        records = self.store._records
+        self.assertIsNotNone(self.store.find_item("a2"))
+        self.assertIs(self.store._records, records)
+
+    def test_changes_of_other_writers_are_loaded(self):
+        """entries appended by another instance are read from the log"""
+        other_store = self.store_class()
+        self.store.add_item(StoreItem("a1", 1))
+        self.assertIsNotNone(other_store.find_item("a1"))
+        records = other_store._records
+        self.store.add_item(StoreItem("a3", 3))
+        other_store.add_item(StoreItem("a2", 2))
+        self.assertIs(other_store._records, records)
+        self.assertEqual(len(other_store._data_list), 3)
+        self.assertEqual(len(self.store.find_items_list("a2")), 1)
+        other_store.compact()
+        self.assertEqual(len(self.store.find_items_list("a1")), 1)
+        self.store.delete_json_file()
+        self.assertIsNone(other_store.find_item("a1"))
+
+    def test_transaction_changes_several_stores(self):
+        """the operations of a transaction are journaled and applied to every store"""
+        other_store = JsonStore(os.path.join(self.folder, "store_other.json"), "item_id")
+        self.store.add_item(StoreItem("a1", 1))
+        with StoreTransaction() as transaction:
+            transaction.erase_item(self.store, "a1")
+            transaction.add_item(other_store, StoreItem("a1", 1))
+        self.assertIsNone(self.store_class().find_item("a1"))
+        self.assertIsNotNone(JsonStore(other_store._FILE_PATH, "item_id").find_item("a1"))
+        self.assertFalse(os.path.isfile(os.path.join(self.folder, "store_transactions.journal")))
+
+    def test_applied_transactions_are_not_replayed(self):
+        """a new process does not apply again the transactions already in the stores"""
+        with StoreTransaction() as transaction:
+            transaction.add_item(self.store, StoreItem("a1", 1))
+        with StoreTransaction() as transaction:
+            transaction.erase_item(self.store, "a1")
+        self.store.add_item(StoreItem("a1", 2))
+        JsonStore._recovered_journals.discard(self.store._journal_path)
+        self.assertEqual(self.store_class().find_item("a1")["value"], 2)
+
+    def test_transaction_is_discarded_on_exception(self):
+        """nothing is written if the block of the transaction raises an exception"""
+        with self.assertRaises(ValueError):
+            with StoreTransaction() as transaction:
+                transaction.add_item(self.store, StoreItem("a1", 1))
+                raise ValueError("interrupted")
+        self.assertIsNone(self.store_class().find_item("a1"))
+
+    def test_journal_is_recovered(self):
+        """a transaction journaled but not applied is applied once by the recovery"""
+        other_path = os.path.join(self.folder, "store_other.json")
+        entry = [{"store": other_path, "id_field": "item_id",
+                  "add": {"item_id": "a1", "value": 1}}]
+        with open(os.path.join(self.folder, "store_transactions.journal"), "w",
+                  encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+        self.store.recover_transactions()
+        self.store_class().recover_transactions()
+        JsonStore._recovered_journals.discard(self.store._journal_path)
+        self.store.recover_transactions()
+        self.assertEqual(len(JsonStore(other_path, "item_id").find_items_list("a1")), 1)
+        self.assertFalse(os.path.isfile(os.path.join(self.folder, "store_transactions.journal")))
+
+    def test_commit_applies_the_transactions_left_in_the_journal(self):
+        """a commit applies the transaction left by another process before emptying it"""
+        self.store.load()
+        other_path = os.path.join(self.folder, "store_other.json")
+        entry = [{"store": other_path, "id_field": "item_id",
+                  "add": {"item_id": "a1", "value": 1}}]
+        with open(os.path.join(self.folder, "store_transactions.journal"), "w",
+                  encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+        with StoreTransaction() as transaction:
+            transaction.add_item(self.store, StoreItem("a2", 2))
+        self.assertIsNotNone(JsonStore(other_path, "item_id").find_item("a1"))
+        self.assertIsNotNone(self.store_class().find_item("a2"))
+        self.assertFalse(os.path.isfile(os.path.join(self.folder, "store_transactions.journal")))
+
+    def test_journal_is_recovered_on_first_load(self):
+        """a store loaded for the first time applies the transaction left in the journal"""
+        entry = [{"store": self.store._FILE_PATH, "id_field": "item_id",
+                  "add": {"item_id": "a1", "value": 1}}]
+        with open(os.path.join(self.folder, "store_transactions.journal"), "w",
+                  encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+        JsonStore._recovered_journals.discard(self.store._journal_path)
+        self.assertIsNotNone(self.store_class().find_item("a1"))
+
+    def test_deleted_store_is_removed_from_the_journal(self):
+        """the journaled operations on a store are dropped when the store is deleted"""
+        entry = [{"store": self.store._FILE_PATH, "id_field": "item_id",
+                  "add": {"item_id": "a1", "value": 1}}]
+        with open(os.path.join(self.folder, "store_transactions.journal"), "w",
+                  encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+        self.store.delete_json_file()
+        self.assertFalse(os.path.isfile(os.path.join(self.folder, "store_transactions.journal")))
+
+    def test_buffered_entries_are_written_by_flush(self):
+        """the buffered durability keeps the entries in memory until they are flushed"""
+        self.store_class._DURABILITY = "buffered"
+        self.store_class._COMMIT_WINDOW = 60
+        store = self.store_class()
+        store.add_item(StoreItem("a1", 1))
+        store.add_item(StoreItem("a2", 2))
+        self.assertIsNotNone(store.find_item("a2"))
+        self.assertIsNone(self.store_class().find_item("a1"))
+        store.flush()
+        self.assertIsNotNone(self.store_class().find_item("a2"))
+
+    def test_delete_drops_the_buffered_entries(self):
+        """the items kept in memory are deleted with the files"""
+        self.store_class._DURABILITY = "buffered"
+        self.store_class._COMMIT_WINDOW = 60
+        self.store_class._validate_item = lambda store, item: \
+            self.assertIsNone(store.find_item(item.item_id))
+        self.store.add_item(StoreItem("a1", 1))
+        self.store.add_item(StoreItem("a2", 2))
+        self.store.delete_json_file()
+        self.assertIsNone(self.store.find_item("a1"))
+        self.assertIsNone(self.store.find_item("a2"))
+        self.store.add_item(StoreItem("a1", 3))
+        self.store.flush()
+        self.assertEqual(self.store_class().find_item("a1")["value"], 3)
+
+    def test_lock_file_is_closed(self):
+        """closing or deleting the store closes its lock file, opened again when used"""
+        self.store.add_item(StoreItem("a1", 1))
+        self.assertIsNotNone(self.store._store_lock._file)
+        self.store.close()
+        self.assertIsNone(self.store._store_lock._file)
+        self.assertEqual(self.store.find_item("a1")["value"], 1)
+        self.store.add_item(StoreItem("a2", 2))
+        self.store.delete_json_file()
+        self.assertIsNone(self.store._store_lock._file)
+        self.assertIsNone(self.store.find_item("a1"))
+
+    def test_buffered_entries_are_written_after_the_window(self):
+        """the buffered entries are written when the commit window ends"""
+        self.store_class._DURABILITY = "buffered"
+        self.store_class._COMMIT_WINDOW = 0.01
+        store = self.store_class()
+        store.add_item(StoreItem("a1", 1))
+        time.sleep(0.2)
+        self.assertIsNotNone(self.store_class().find_item("a1"))
+
+    def test_concurrent_adds_share_syncs(self):
+        """the threads waiting for a sync have their entries written by one sync"""
+        real_fsync = os.fsync
+        fsync_calls = []
+
+        def slow_fsync(file_descriptor):
+            fsync_calls.append(file_descriptor)
+            time.sleep(0.005)
+            real_fsync(file_descriptor)
+
+        def add_items(first):
+            for number in range(first, first + 10):
+                self.store.add_item(StoreItem("id" + str(number), number))
+
+        with mock.patch("os.fsync", slow_fsync):
+            threads = [threading.Thread(target=add_items, args=(first,))
+                       for first in range(0, 80, 10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertLess(len(fsync_calls), 80)
+        self.assertEqual(len(self.store_class()._data_list), 80)
+
+    def test_save_replaces_the_snapshot(self):
+        """the snapshot is written to a temporary file renamed over the old one"""
+        self.store.add_item(StoreItem("a1", 1))
+        self.store.compact()
+        inode = os.stat(self.store_class._FILE_PATH).st_ino
+        self.store.add_item(StoreItem("a2", 2))
+        self.store.compact()
+        self.assertNotEqual(os.stat(self.store_class._FILE_PATH).st_ino, inode)
+        self.assertEqual(sorted(os.listdir(self.folder)),
+                         ["store_items.json", "store_items.json.lock"])
+
+    def test_metrics_count_live_and_dead_records(self):
+        """the erased records are counted as dead until the store is compacted"""
+        for number in range(4):
+            self.store.add_item(StoreItem("id" + str(number), number))
+        self.store.erase_item("id1")
+        self.store.erase_item("id2")
+        metrics = self.store_class().store_metrics()
+        self.assertEqual(metrics["live_records"], 2)
+        self.assertEqual(metrics["dead_records"], 2)
+        self.assertEqual(metrics["log_additions"], 4)
+        self.store.compact()
+        metrics = self.store.store_metrics()
+        self.assertEqual(metrics["dead_records"], 0)
+        self.assertEqual(metrics["snapshot_records"], 2)
+
+    def test_dead_ratio_compacts_in_background(self):
+        """a store with mostly erased records is compacted by a background thread"""
+        self.store_class._COMPACTION_MIN_DEAD = 5
+        for number in range(10):
+            self.store.add_item(StoreItem("id" + str(number), number))
+        for number in range(6):
+            self.store.erase_item("id" + str(number))
+        self.store._compaction_thread.join()
+        self.assertIsNone(self.store.find_item("id0"))
+        metrics = self.store.store_metrics()
+        self.assertEqual(metrics["live_records"], 4)
+        self.assertEqual(metrics["dead_records"], 0)
+        with open(self.store_class._FILE_PATH, "r", encoding="utf-8") as file:
+            self.assertEqual(len(json.load(file)), 4)
+
+    def test_data_hash_is_kept_incrementally(self):
+        """the digest follows the adds and erases and does not depend on the order"""
+        empty_hash = self.store.data_hash()
+        self.store.add_item(StoreItem("a1", 1))
+        self.store.add_item(StoreItem("a2", 2))
+        other_store = self.store_class(os.path.join(self.folder, "store_other.json"))
+        other_store.add_item(StoreItem("a2", 2))
+        other_store.add_item(StoreItem("a1", 1))
+        self.assertEqual(self.store.data_hash(), other_store.data_hash())
+        self.store.compact()
+        self.assertEqual(self.store_class().data_hash(), other_store.data_hash())
+        self.store.erase_item("a1")
+        self.store.erase_item("a2")
+        self.assertEqual(self.store.data_hash(), empty_hash)
+
+    def test_iter_items_streams_snapshot_and_log(self):
+        """the items are read from the files with the log tombstones applied"""
+        for number in range(5):
+            self.store.add_item(StoreItem("id" + str(number), number % 2))
+        self.store.compact()
+        self.store.add_item(StoreItem("id1", 7))
+        self.store.erase_item("id1")
+        self.store.add_item(StoreItem("id5", 1))
+        self.store.erase_item("id5")
+        self.store.add_item(StoreItem("id6", 1))
+        self.assertEqual([item["item_id"] for item in self.store.iter_items()],
+                         [item["item_id"] for item in self.store_class()._data_list])
+        self.assertEqual([item["value"] for item in
+                          self.store.iter_items(lambda item: item["item_id"] == "id1")], [7])
+        self.assertEqual([len(chunk) for chunk in self.store.iter_chunks(4)], [4, 2])
+
+    def test_iter_items_opens_the_files_holding_the_lock(self):
+        """the snapshot and the log are opened holding the shared lock of the files"""
+        self.store.add_item(StoreItem("a1", 1))
+        store_lock = self.store._store_lock
+        with mock.patch.object(store_lock, "acquire", wraps=store_lock.acquire) as acquire:
+            self.assertEqual(len(list(self.store.iter_items())), 1)
+        self.assertIn(mock.call(False), acquire.call_args_list)
+
+    def test_iter_items_decodes_the_snapshot_in_chunks(self):
+        """items split between the chunks read from the snapshot are decoded"""
+        items = [{"item_id": "id" + str(number), "value": number * 1000}
+                 for number in range(50)]
+        with open(self.store_class._FILE_PATH, "w", encoding="utf-8") as file:
+            json.dump(items, file, indent=2)
+        with open(self.store_class._FILE_PATH, "r", encoding="utf-8") as file:
+            self.assertEqual(list(JsonStore._stream_snapshot(file, 7)), items)
+
+    def test_add_items_validates_the_batch_and_persists_once(self):
+        """the items of a batch are checked against the store and the batch itself"""
+        def validate_item(store, item):
+            if store.find_item(item.item_id) is not None:
+                raise VaccineManagementException("item_id is registered")
+        self.store_class._validate_item = validate_item
+        store = self.store_class()
+        store.add_item(StoreItem("a1", 1))
+        with mock.patch.object(store, "_sync_log", wraps=store._sync_log) as sync_log:
+            results = store.add_items([StoreItem("a2", 2), StoreItem("a1", 3),
+                                       StoreItem("a3", 4), StoreItem("a2", 5)])
+        self.assertEqual(sync_log.call_count, 1)
+        self.assertEqual([result.error is None for result in results],
+                         [True, False, True, False])
+        self.assertEqual(results[1].error.message, "item_id is registered")
+        self.assertEqual(len(self.store_class()._data_list), 3)
+
+    def test_processes_do_not_lose_writes(self):
+        """the processes adding items and compacting the same store keep every item"""
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=add_store_items,
+                                     args=(self.store_class._FILE_PATH, first))
+                     for first in range(0, 40, 10)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(len(CompactingJsonStore(self.store_class._FILE_PATH)._data_list), 40)
+
+    def test_processes_do_not_add_the_same_item(self):
+        """the items are validated against the ones added by the other processes"""
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=add_unique_items,
+                                     args=(self.store_class._FILE_PATH,))
+                     for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(len(UniqueItemsJsonStore(self.store_class._FILE_PATH)._data_list), 10)
+
+    def test_generation_validation_reloads_after_other_writers(self):
+        """with the generation validation only the changes counted in the lock file are seen"""
+        self.store_class._CACHE_VALIDATION = "generation"
+        store = self.store_class()
+        other_store = self.store_class()
+        store.add_item(StoreItem("a1", 1))
+        self.assertIsNotNone(other_store.find_item("a1"))
+        records = other_store._records
+        self.assertIsNotNone(other_store.find_item("a1"))
+        self.assertIs(other_store._records, records)
+        with open(self.store_class._FILE_PATH + ".log", "a", encoding="utf-8") as file:
+            file.write(json.dumps({"add": {"item_id": "a2", "value": 2}}) + "\n")
+        self.assertIsNone(other_store.find_item("a2"))
+        store.erase_item("a1")
+        self.assertIsNone(other_store.find_item("a1"))
+        self.assertIsNotNone(other_store.find_item("a2"))
+
+    def test_threads_add_and_read_concurrently(self):
+        """the threads adding the same items add each of them once while others read"""
+        def validate_item(store, item):
+            if store.find_item(item.item_id) is not None:
+                raise VaccineManagementException("item_id is registered")
+        self.store_class._validate_item = validate_item
+        store = self.store_class()
+        errors = []
+
+        def add_items():
+            for number in range(20):
+                try:
+                    store.add_item(StoreItem("id" + str(number), number))
+                except VaccineManagementException:
+                    pass
+
+        def read_items():
+            try:
+                for number in range(200):
+                    store.find_items_list("id" + str(number % 20))
+            except Exception as exception_raised:  # pylint: disable=broad-except
+                errors.append(exception_raised)
+
+        threads = [threading.Thread(target=target)
+                   for target in [add_items, read_items] * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.store_class()._data_list), 20)
+
+    def test_schema_records_read_legacy_files(self):
+        """a store with a schema reads legacy objects and writes lists of values"""
+        schema = RecordSchema("SchemaItem", ["item_id", "value"])
+        legacy = [{"_SchemaItem__item_id": "id" + str(number), "_SchemaItem__value": number}
+                  for number in range(50)]
+        with open(self.store_class._FILE_PATH, "w", encoding="utf-8") as file:
+            json.dump(legacy, file, indent=2)
+        legacy_size = os.path.getsize(self.store_class._FILE_PATH)
+        store = self.store_class(id_field="_SchemaItem__item_id", record_schema=schema)
+
+        record = store.find_item("id7")
+        self.assertIsInstance(record, Record)
+        self.assertEqual(record["_SchemaItem__value"], 7)
+        self.assertEqual(dict(record), legacy[7])
+        store.add_item(SchemaItem("id50", 50))
+        store.erase_item("id0")
+        self.assertEqual([item["_SchemaItem__value"] for item in store.iter_items()],
+                         list(range(1, 51)))
+        store.compact()
+        with open(self.store_class._FILE_PATH, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file)[0], ["id1", 1])
+        self.assertLess(os.path.getsize(self.store_class._FILE_PATH) * 3, legacy_size)
+        reloaded = self.store_class(id_field="_SchemaItem__item_id", record_schema=schema)
+        self.assertEqual(dict(reloaded.find_item("id50")),
+                         {"_SchemaItem__item_id": "id50", "_SchemaItem__value": 50})
+
+    def test_schema_records_read_before_fields_added(self):
+        """the records written before a field was added to the schema have it as None"""
+        old_schema = RecordSchema("SchemaItem", ["item_id", "value"])
+        store = self.store_class(id_field="_SchemaItem__item_id", record_schema=old_schema)
+        store.add_item(SchemaItem("id0", 0))
+        store.compact()
+        store.add_item(SchemaItem("id1", 1))
+        new_schema = RecordSchema("SchemaItem", ["item_id", "value", "note"])
+        reloaded = self.store_class(id_field="_SchemaItem__item_id", record_schema=new_schema)
+        self.assertEqual(dict(reloaded.find_item("id0")),
+                         {"_SchemaItem__item_id": "id0", "_SchemaItem__value": 0,
+                          "_SchemaItem__note": None})
+        self.assertIsNone(reloaded.find_item("id1")["_SchemaItem__note"])
+        with self.assertRaises(VaccineManagementException):
+            RecordSchema("SchemaItem", ["item_id"]).record(["id0", 0])
@@ -1,10 +1,17 @@
 """Module for testing request_vaccination_id"""
 import unittest
+from datetime import datetime
 from freezegun import freeze_time
 
 from uc3m_care import VaccineManager
 from uc3m_care import VaccineManagementException
 from uc3m_care import PatientsJsonStore
+from uc3m_care.data.clock import Clock, FixedClock
+from uc3m_care.data.attribute.attribute import Attribute
+from uc3m_care.data.attribute.attribute_age import Age
+from uc3m_care.data.attribute.attribute_patient_id import PatientId
+from uc3m_care.data.attribute.attribute_phone_number import PhoneNumber
+from uc3m_care.data.vaccine_patient_register import VaccinePatientRegister
 
 #"""
 #      import uuid
@@ -212,6 +219,40 @@ class TestRequestVacID(unittest.TestCase):
 
         self.assertEqual("Registration type is nor valid", context_manager.exception.message)
         self.assertEqual(hash_new,hash_original)
+    def test_request_registered_patient_rebuilt_from_time_stamp(self):
+        """a patient registered at any time of the day is rebuilt from its time_stamp"""
+        file_store = PatientsJsonStore()
+        file_store.delete_json_file()
+        previous_clock = Clock.install(FixedClock(datetime(2022, 3, 8, 17, 45, 12, 345678)))
+        try:
+            patient_sys_id = VaccineManager().request_vaccination_id(
+                "78924cb0-075a-4099-a3ee-f3b562e805b9", "minombre tienelalongitudmaxima",
+                "Regular", "+34123456789", "6")
+        finally:
+            Clock.install(previous_clock)
+        patient = VaccinePatientRegister.create_patient_from_patient_system_id(patient_sys_id)
+        self.assertEqual(patient.patient_sys_id, patient_sys_id)
+        self.assertEqual(patient.time_stamp,
+                         datetime.timestamp(datetime(2022, 3, 8, 17, 45, 12, 345678)))
+
+    def test_request_values_checked_by_columns(self):
+        """the columns of values return the first error of every row without raising"""
+        values, errors = Attribute.check_columns(
+            {PatientId: ["78924CB0-075A-4099-A3EE-F3B562E805B9", "bad", "bad"],
+             PhoneNumber: ["+34123456789", "+34123456789", "+3412"],
+             Age: ["6", "5", "126"]})
+        self.assertEqual(values[PatientId],
+                         ["78924cb0-075a-4099-a3ee-f3b562e805b9", None, None])
+        self.assertEqual(values[Age], ["6", None, None])
+        self.assertIsNone(errors[0])
+        self.assertEqual(errors[1].message, "Id received is not a UUID")
+        self.assertEqual(errors[2].message, "Id received is not a UUID")
+        self.assertEqual(Age.check("126")[1].message, "age is not valid")
+        self.assertEqual(Age.check("½")[1].message, "age is not valid")
+        self.assertEqual(Age.check("1²")[1].message, "age is not valid")
+        self.assertEqual(Age.check(12)[1].message, "age is not valid")
+        self.assertEqual(PhoneNumber.check("+3412")[1].message, "phone number is not valid")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+"""Tests for the ShardedJsonStore storage engine"""
+import json
+import os
+from unittest import mock
+
+from uc3m_care.storage.json_store import JsonStore
+from uc3m_care.storage.sharded_json_store import ShardedJsonStore
+from uc3m_care.storage.store_transaction import StoreTransaction
+from store_test_helpers import StoreItem, StoreTestCase
+
+
+class TestShardedJsonStore(StoreTestCase):
+    """Tests for the JsonStore methods implemented with shards"""
+    store_base = ShardedJsonStore
+
+    def store_attributes(self):
+        """The items are saved in four shards and indexed by value"""
+        return dict(super().store_attributes(), _INDEX_FIELDS=["value"], _SHARDS=4)
+
+    def test_items_are_routed_by_id_prefix(self):
+        """each item is written only to the shard of its id prefix"""
+        self.store.add_item(StoreItem("0000aa", 1))
+        self.store.add_item(StoreItem("0001bb", 2))
+        self.store.add_item(StoreItem("0003cc", 2))
+        self.assertEqual(len(self.store.shards[0]._data_list), 1)
+        self.assertEqual(len(self.store.shards[1]._data_list), 1)
+        self.assertEqual(len(self.store.shards[2]._data_list), 0)
+        self.assertEqual(self.store_class().find_item("0003cc")["value"], 2)
+        self.assertEqual(len(self.store.find_items_list(2, "value")), 2)
+        self.store.erase_item("0001bb")
+        self.assertIsNone(self.store_class().find_item("0001bb"))
+        self.assertEqual(len(self.store_class()._data_list), 2)
+
+    def test_unsharded_store_is_migrated(self):
+        """the items of a store saved in a single file are moved to the shards"""
+        with open(self.store_class._FILE_PATH, "w", encoding="utf-8") as file:
+            json.dump([{"item_id": "0002aa", "value": 1}, {"item_id": "zz", "value": 2}], file)
+        store = self.store_class()
+        self.assertIsNotNone(store.find_item("0002aa"))
+        self.assertFalse(os.path.isfile(self.store_class._FILE_PATH))
+        self.assertIsNotNone(self.store_class().find_item("zz"))
+
+    def test_stopped_migration_is_resumed(self):
+        """the items already moved by a migration that stopped are not added again"""
+        with open(self.store_class._FILE_PATH, "w", encoding="utf-8") as file:
+            json.dump([{"item_id": "0002aa", "value": 1}, {"item_id": "zz", "value": 2}], file)
+        shard = JsonStore(self.store._shard_path(2), "item_id")
+        shard.add_item(StoreItem("0002aa", 1))
+        shard.close()
+        self.assertEqual(len(self.store_class().find_items_list("0002aa")), 1)
+        self.assertEqual(len(self.store_class()._data_list), 2)
+
+    def test_items_are_added_holding_only_their_shard_lock(self):
+        """the writers of different shards do not wait for the lock of the sharded store"""
+        self.store.load()
+        store_lock = self.store._store_lock
+        with mock.patch.object(store_lock, "acquire", wraps=store_lock.acquire) as acquire:
+            self.store.add_item(StoreItem("0000aa", 1))
+            self.store.add_items([StoreItem("0001aa", 2), StoreItem("0002aa", 3)])
+        self.assertEqual(acquire.call_count, 0)
+        self.assertEqual(len(self.store_class()._data_list), 3)
+
+    def test_transaction_on_shards(self):
+        """the operations of a transaction are journaled with their shard"""
+        self.store.add_item(StoreItem("0000aa", 1))
+        with StoreTransaction() as transaction:
+            transaction.erase_item(self.store, 1, "value")
+            transaction.add_item(self.store, StoreItem("0002bb", 2))
+        store = self.store_class()
+        self.assertIsNone(store.find_item("0000aa"))
+        self.assertIsNotNone(store.find_item("0002bb"))
+
+    def test_differing_items_are_found_by_shard_digests(self):
+        """two copies of a store are compared only in the shards whose digests differ"""
+        copy_folder = os.path.join(self.folder, "copy")
+        os.mkdir(copy_folder)
+
+        class CopyShardedStore(self.store_class):
+            """Copy of the store in another folder"""
+            _FILE_PATH = os.path.join(copy_folder, "store_items.json")
+
+        copy_store = CopyShardedStore()
+        for store in (self.store, copy_store):
+            store.add_item(StoreItem("0000aa", 1))
+            store.add_item(StoreItem("0001bb", 2))
+        self.assertEqual(self.store.data_hash(), copy_store.data_hash())
+        self.assertEqual(self.store.differing_shards(copy_store), [])
+        self.store.add_item(StoreItem("0002cc", 3))
+        copy_store.erase_item("0001bb")
+        self.assertEqual(self.store.differing_shards(copy_store), [1, 2])
+        own_items, other_items = self.store.differing_items(copy_store)
+        self.assertEqual(sorted(item["item_id"] for item in own_items), ["0001bb", "0002cc"])
+        self.assertEqual(other_items, [])
@@ -0,0 +1,80 @@
+"""Tests for the SqliteStore storage engine"""
+import os
+
+from uc3m_care.storage.sqlite_store import SqliteStore
+from uc3m_care.storage.store_transaction import StoreTransaction
+from store_test_helpers import StoreItem, StoreTestCase
+
+
+class TestSqliteStore(StoreTestCase):
+    """Tests for the JsonStore methods implemented with SQLite"""
+    store_base = SqliteStore
+
+    def store_attributes(self):
+        """The items are saved in a database of the folder and indexed by value"""
+        return dict(super().store_attributes(), _DB_PATH=os.path.join(self.folder, "stores.db"),
+                    _INDEX_FIELDS=["value"])
+
+    def tearDown(self) -> None:
+        vars(SqliteStore._connections).pop(self.store_class._DB_PATH).close()
+        super().tearDown()
+
+    def test_add_find_and_erase(self):
+        """items are found by id and by an indexed field"""
+        self.store.add_item(StoreItem("a1", 1))
+        self.store.add_item(StoreItem("a2", 1))
+        self.store.add_item(StoreItem("a3", 2))
+        self.assertEqual(self.store.find_item("a2"), {"item_id": "a2", "value": 1})
+        self.assertEqual(len(self.store.find_items_list(1, "value")), 2)
+        self.store.erase_item(1, "value")
+        self.assertIsNone(self.store.find_item("a1"))
+        self.assertEqual(self.store_class().find_item(1, "value")["item_id"], "a2")
+
+    def test_wal_mode_and_id_index(self):
+        """the database is in WAL mode and the id lookup uses the index"""
+        self.store.load()
+        connection = self.store._connection
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        plan = connection.execute("EXPLAIN QUERY PLAN SELECT item FROM store_items "
+                                  "WHERE id_value = 'a1'").fetchall()
+        self.assertIn("store_items_id", str(plan))
+
+    def test_empty_and_data_hash(self):
+        """empty_json_file removes every item and changes the hash"""
+        empty_hash = self.store.data_hash()
+        self.store.add_item(StoreItem("a1", 1))
+        self.assertNotEqual(self.store.data_hash(), empty_hash)
+        self.store.empty_json_file()
+        self.assertEqual(self.store.data_hash(), empty_hash)
+        self.assertEqual(self.store.find_items_list("a1"), [])
+
+    def test_data_hash_of_a_previous_table(self):
+        """the digest of a table without digests is computed once and then kept"""
+        self.store.add_item(StoreItem("a1", 1))
+        self.store.add_item(StoreItem("a2", 2))
+        data_hash = self.store.data_hash()
+        connection = self.store._connection
+        connection.execute("DROP TABLE store_digests")
+        connection.execute("DROP TRIGGER store_items_add")
+        connection.execute("UPDATE store_items SET digest = NULL")
+        self.assertEqual(self.store_class().data_hash(), data_hash)
+        self.store.erase_item("a2")
+        self.store.add_item(StoreItem("a2", 2))
+        self.assertEqual(self.store.data_hash(), data_hash)
+
+    def test_transaction_is_atomic(self):
+        """the operations of a failed transaction are rolled back"""
+        self.store.add_item(StoreItem("a1", 1))
+        with StoreTransaction() as transaction:
+            transaction.erase_item(self.store, "a1")
+            transaction.add_item(self.store, StoreItem("a2", 2))
+        self.assertIsNone(self.store.find_item("a1"))
+        transaction = StoreTransaction()
+        transaction.add_item(self.store, StoreItem("a3", 3))
+        transaction.erase_item(self.store, "a2")
+        # a value that cannot be saved in JSON makes the last operation fail
+        transaction.add_item(self.store, StoreItem("a4", {4}))
+        with self.assertRaises(TypeError):
+            transaction.commit()
+        self.assertIsNone(self.store.find_item("a3"))
+        self.assertIsNotNone(self.store.find_item("a2"))
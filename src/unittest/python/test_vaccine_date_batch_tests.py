@@ -0,0 +1,68 @@
+"""Tests for the batch of get_vaccine_date requests"""
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_care import VaccineManager
+from uc3m_care import JSON_FILES_RF2_PATH
+from uc3m_care import AppointmentsJsonStore
+from uc3m_care import PatientsJsonStore
+
+
+class TestVaccineDateBatch(TestCase):
+    """Unit tests for get_vaccine_dates in VaccineManager"""
+
+    def setUp(self) -> None:
+        PatientsJsonStore().delete_json_file()
+        AppointmentsJsonStore().delete_json_file()
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
+
+    @freeze_time("2022-03-08")
+    def test_get_vaccine_dates_pairs(self):
+        """every request gets its date_signature or its error"""
+        my_manager = VaccineManager()
+        my_manager.request_vaccination_id("78924cb0-075a-4099-a3ee-f3b562e805b9",
+                                          "minombre tienelalongitudmaxima",
+                                          "Regular", "+34123456789", "6")
+        requests = [(JSON_FILES_RF2_PATH + "test_ok.json", "2022-03-18"),
+                    (JSON_FILES_RF2_PATH + "test_no_ok.json", "2022-03-18"),
+                    (JSON_FILES_RF2_PATH + "test_empty.json", "2022-03-18"),
+                    (JSON_FILES_RF2_PATH + "missing.json", "2022-03-18"),
+                    (JSON_FILES_RF2_PATH + "test_ok.json", "2022-03-08"),
+                    (JSON_FILES_RF2_PATH + "test_ok.json", "2022-03-18")]
+        results = my_manager.get_vaccine_dates(requests)
+        self.assertEqual([request for request, _ in results], requests)
+        self.assertEqual(results[0][1],
+                         "5a06c7bede3d584e934e2f5bd3861e625cb31937f9f1a5362a51fbbf38486f1c")
+        self.assertEqual(results[1][1].message, "patient system id is not valid")
+        self.assertEqual(results[2][1].message, "Bad label patient_id")
+        self.assertEqual(results[3][1].message, "File is not found")
+        self.assertEqual(results[4][1].message, "Fecha igual o anterior a la actual")
+        # the request given twice gets the result of each of its appointments
+        self.assertEqual(results[5][1], results[0][1])
+        self.assertEqual(len(AppointmentsJsonStore()._data_list), 2)
+
+    @freeze_time("2022-03-08")
+    def test_get_vaccine_dates_directory_and_manifest(self):
+        """the requests are read from a directory or from a manifest"""
+        my_manager = VaccineManager()
+        my_manager.request_vaccination_id("78924cb0-075a-4099-a3ee-f3b562e805b9",
+                                          "minombre tienelalongitudmaxima",
+                                          "Regular", "+34123456789", "6")
+        shutil.copy(JSON_FILES_RF2_PATH + "test_ok.json", self.folder)
+        results = my_manager.get_vaccine_dates(self.folder, "2022-03-18")
+        self.assertEqual([result for _, result in results],
+                         ["5a06c7bede3d584e934e2f5bd3861e625cb31937f9f1a5362a51fbbf38486f1c"])
+        manifest_file = os.path.join(self.folder, "manifest.txt")
+        with open(manifest_file, "w", encoding="utf-8") as file:
+            json.dump([{"input_file": "test_ok.json", "date": "2022-03-08"}], file)
+        results = my_manager.get_vaccine_dates(manifest_file)
+        self.assertEqual(results[0][0], (os.path.join(self.folder, "test_ok.json"),
+                                         "2022-03-08"))
+        self.assertEqual(results[0][1].message,
+                         "Fecha igual o anterior a la actual")
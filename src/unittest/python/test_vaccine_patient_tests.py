@@ -8,6 +8,8 @@ from uc3m_care import JSON_FILES_RF2_PATH
 from uc3m_care.storage.vaccination_json_store import VaccinationJsonStore
 from uc3m_care.storage.appointments_json_store import AppointmentsJsonStore
 from uc3m_care.storage.patients_json_store import PatientsJsonStore
+from uc3m_care.storage.store_transaction import StoreTransaction
+from uc3m_care.data.vaccination_appointment import VaccinationAppointment
 
 class TestVaccinePatient(TestCase):
     """Class for testing vaccine patient"""
@@ -123,3 +125,76 @@ class TestVaccinePatient(TestCase):
             my_manager.vaccine_patient(
                 "5a06c7bede3d584e934e2f5bd3861e625cb31937f9f1a5362a51fbbf38486f1c")
         self.assertEqual(context_manager.exception.message, "date_signature is not found")
+
+    @freeze_time("2022-03-18")
+    def test_vaccine_patient_without_patient(self):
+        """the appointment is verified, so its patient must still be in the store"""
+        PatientsJsonStore().empty_json_file()
+        file_store_vaccine = VaccinationJsonStore()
+        hash_original = file_store_vaccine.data_hash()
+        my_manager = VaccineManager()
+        with self.assertRaises(VaccineManagementException) as context_manager:
+            my_manager.vaccine_patient(
+                "5a06c7bede3d584e934e2f5bd3861e625cb31937f9f1a5362a51fbbf38486f1c")
+        self.assertEqual(context_manager.exception.message, "patient_system_id not found")
+        self.assertEqual(file_store_vaccine.data_hash(), hash_original)
+
+    @freeze_time("2022-03-18")
+    def test_vaccination_day_check_in_ok(self):
+        """the appointments of the day are preloaded and checked in from the roster"""
+        file_store_vaccine = VaccinationJsonStore()
+        file_store_vaccine.delete_json_file()
+        my_manager = VaccineManager()
+        with my_manager.open_vaccination_day() as roster:
+            self.assertEqual(len(roster.appointments), 2)
+            self.assertEqual(roster.rejected, {})
+            value = roster.check_in(
+                "5a06c7bede3d584e934e2f5bd3861e625cb31937f9f1a5362a51fbbf38486f1c")
+            self.assertTrue(value)
+        vaccination_entry = file_store_vaccine.find_item(
+            "5a06c7bede3d584e934e2f5bd3861e625cb31937f9f1a5362a51fbbf38486f1c")
+        self.assertIsNotNone(vaccination_entry)
+
+    @freeze_time("2022-03-18")
+    def test_vaccination_day_check_in_not_found(self):
+        """a date_signature that is not in the roster follows the regular path"""
+        file_store_vaccine = VaccinationJsonStore()
+        my_manager = VaccineManager()
+        hash_original = file_store_vaccine.data_hash()
+        with my_manager.open_vaccination_day() as roster:
+            with self.assertRaises(VaccineManagementException) as context_manager:
+                roster.check_in(
+                    "7a8403d8605804cf2534fd7885940f3c3d8ec60ba578bc158b5dc2b9fb68d524")
+        self.assertEqual(context_manager.exception.message, "date_signature is not found")
+        self.assertEqual(file_store_vaccine.data_hash(), hash_original)
+
+    @freeze_time("2022-03-18")
+    def test_vaccination_day_check_in_cancelled(self):
+        """an appointment erased after the roster was loaded is not checked in"""
+        date_signature = "5a06c7bede3d584e934e2f5bd3861e625cb31937f9f1a5362a51fbbf38486f1c"
+        file_store_vaccine = VaccinationJsonStore()
+        file_store_vaccine.delete_json_file()
+        my_manager = VaccineManager()
+        with my_manager.open_vaccination_day() as roster:
+            with StoreTransaction() as transaction:
+                transaction.erase_item(AppointmentsJsonStore(), date_signature)
+            with self.assertRaises(VaccineManagementException) as context_manager:
+                roster.check_in(date_signature)
+        self.assertEqual(context_manager.exception.message, "date_signature is not found")
+        self.assertIsNone(file_store_vaccine.find_item(date_signature))
+
+    def test_appointment_from_record_verified(self):
+        """the stored appointment is rebuilt as it is and verified apart"""
+        date_signature = "5a06c7bede3d584e934e2f5bd3861e625cb31937f9f1a5362a51fbbf38486f1c"
+        appointment = VaccinationAppointment.get_appointment_from_date_signature(
+            date_signature, verify=True)
+        self.assertEqual(appointment.date_signature, date_signature)
+        self.assertEqual(appointment.vaccination_signature, date_signature)
+
+        record = dict(AppointmentsJsonStore().find_item(date_signature))
+        record["_VaccinationAppointment__appointment_date"] += 24 * 60 * 60
+        manipulated = VaccinationAppointment.from_record(record)
+        errors = VaccinationAppointment.verify_appointments([appointment, manipulated])
+        self.assertEqual(list(errors), [date_signature])
+        self.assertEqual(errors[date_signature].message,
+                         "Appointment's data have been manipulated")
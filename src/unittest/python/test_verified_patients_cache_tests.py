@@ -0,0 +1,58 @@
+"""Module for testing the cache of verified patients"""
+import unittest
+from types import SimpleNamespace
+from unittest import TestCase
+from freezegun import freeze_time
+from uc3m_care import VaccineManager
+from uc3m_care.data.vaccine_patient_register import VaccinePatientRegister
+from uc3m_care.data.verified_patients_cache import VerifiedPatientsCache
+from uc3m_care.storage.patients_json_store import PatientsJsonStore
+
+
+class TestVerifiedPatientsCache(TestCase):
+    """Class for testing the cache of verified patients"""
+    @freeze_time("2022-03-08")
+    def setUp(self):
+        """registers a patient in an empty store"""
+        PatientsJsonStore().delete_json_file()
+        VaccinePatientRegister._verified_patients.clear()
+        self.patient_sys_id = VaccineManager().request_vaccination_id(
+            "78924cb0-075a-4099-a3ee-f3b562e805b9", "minombre tienelalongitudmaxima",
+            "Regular", "+34123456789", "6")
+
+    def test_patient_cached_until_store_changes(self):
+        """the patient is verified once while the store does not change"""
+        cache = VaccinePatientRegister._verified_patients
+        patient = VaccinePatientRegister.create_patient_from_patient_system_id(
+            self.patient_sys_id)
+        version = PatientsJsonStore().data_version()
+        self.assertIsNotNone(cache.get(self.patient_sys_id, version))
+        again = VaccinePatientRegister.create_patient_from_patient_system_id(
+            self.patient_sys_id)
+        self.assertEqual(again.patient_sys_id, patient.patient_sys_id)
+        self.assertIsNot(again, patient)
+
+        with freeze_time("2022-03-08"):
+            VaccineManager().request_vaccination_id(
+                "57c811e5-3f5a-4a89-bbb8-11c0464d53e6", "minombre tieneuncharmenosqmax",
+                "Family", "+34333456789", "7")
+        new_version = PatientsJsonStore().data_version()
+        self.assertNotEqual(new_version, version)
+        self.assertIsNone(cache.get(self.patient_sys_id, new_version))
+
+    def test_least_recently_used_evicted(self):
+        """the patient used least recently is dropped when the cache is full"""
+        patient_a, patient_b, patient_c = (SimpleNamespace(patient_sys_id=patient_sys_id)
+                                           for patient_sys_id in ("A", "B", "C"))
+        cache = VerifiedPatientsCache(2)
+        cache.put(patient_a, 1)
+        cache.put(patient_b, 1)
+        self.assertIs(cache.get("A", 1), patient_a)
+        cache.put(patient_c, 1)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("B", 1))
+        self.assertIs(cache.get("A", 1), patient_a)
+        self.assertIs(cache.get("C", 1), patient_c)
+
+if __name__ == '__main__':
+    unittest.main()